@@ -0,0 +1,69 @@
+"""Compare the time it takes to create models from query engine data with and without validation.
+
+Requires the client to be generated using the test schema:
+
+    prisma generate --schema=tests/data/schema.prisma
+"""
+import sys
+import timeit
+import argparse
+import datetime
+from typing import Any, Callable, Dict, List
+
+from prisma import models
+from prisma._construct import get_constructor
+
+
+def make_records(count: int) -> List[Dict[str, Any]]:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return [
+        {
+            'id': f'ckq{i:010}',
+            'created_at': now.isoformat(),
+            'updated_at': now.isoformat(),
+            'title': f'Post {i}',
+            'published': bool(i % 2),
+            'views': i,
+            'desc': None,
+            'author_id': 'ckqauthor',
+            'author': {'id': 'ckqauthor', 'name': 'Robert'},
+            'categories': [{'id': 1, 'name': 'Category'}, {'id': 2, 'name': 'Other'}],
+        }
+        for i in range(count)
+    ]
+
+
+def bench(
+    name: str, parse: Callable[[Any], Any], records: List[Dict[str, Any]], number: int
+) -> float:
+    elapsed = min(
+        timeit.repeat(lambda: [parse(r) for r in records], number=number, repeat=5)
+    )
+    per_record = elapsed / (number * len(records)) * 1e6
+    print(f'{name:<14} {elapsed:.4f}s total, {per_record:.2f}us per record')
+    return elapsed
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=1000)
+    parser.add_argument('--number', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    records = make_records(args.records)
+
+    # sanity check that every method creates the same models
+    construct = get_constructor(models.Post)
+    expected = [models.Post.parse_obj(r) for r in records]
+    assert [construct(r) for r in records] == expected
+    assert [models.Post._from_engine(r) for r in records] == expected
+
+    validated = bench('parse_obj', models.Post.parse_obj, records, args.number)
+    constructed = bench('construct', construct, records, args.number)
+    generated = bench('_from_engine', models.Post._from_engine, records, args.number)
+    print(f'construct speedup: {validated / constructed:.2f}x')
+    print(f'_from_engine speedup: {validated / generated:.2f}x')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+
+# pins every requirement in the given requirements files to its minimum
+# supported version so that the minimum versions can be tested, e.g.
+# `orjson>=3.1.0` is written as `orjson==3.1.0`
+
+
+def main() -> None:
+    output, *files = sys.argv[1:]
+    pinned = []
+    for file in files:
+        for line in Path(file).read_text().splitlines():
+            requirement = line.split(';')[0].strip()
+            if not requirement:
+                continue
+
+            if '>=' not in requirement:
+                raise ValueError(
+                    f'Requirement in {file} does not have a minimum version: {line}'
+                )
+
+            pinned.append(requirement.replace('>=', '=='))
+
+    Path(output).write_text('\n'.join(pinned) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -31,6 +31,9 @@ extras = {
     'docs': requirements('docs.txt'),
     'aiohttp': requirements('aiohttp.txt'),
     'requests': requirements('requests.txt'),
+    'orjson': requirements('orjson.txt'),
+    'ujson': requirements('ujson.txt'),
+    'columns': requirements('columns.txt'),
 }
 
 
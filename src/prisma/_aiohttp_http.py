@@ -1,5 +1,5 @@
 import asyncio
-from typing import Any
+from typing import Any, AsyncIterator, Dict
 
 import aiohttp
 
@@ -18,14 +18,35 @@ class HTTP(AbstractHTTP[aiohttp.ClientSession, aiohttp.ClientResponse]):
     async def download(self, url: str, dest: str) -> None:
         async with self.session.get(url, raise_for_status=True, timeout=None) as resp:
             with open(dest, 'wb') as fd:
-                # TODO: read and write in chunks
-                fd.write(await resp.read())
+                async for chunk in resp.content.iter_chunked(65536):
+                    fd.write(chunk)
 
     async def request(self, method: Method, url: str, **kwargs: Any) -> 'Response':
         return Response(await self.session.request(method, url, **kwargs))
 
+    async def stream(self, method: Method, url: str, **kwargs: Any) -> 'Response':
+        # aiohttp does not read the response body until it is requested
+        return await self.request(method, url, **kwargs)
+
     def open(self) -> None:
-        self.session = aiohttp.ClientSession()
+        kwargs: Dict[str, Any] = {}
+        config = self.config
+
+        pool_size = config.get('pool_size')
+        if pool_size is not None:
+            kwargs['limit'] = pool_size
+
+        keepalive_timeout = config.get('keepalive_timeout')
+        if keepalive_timeout is not None:
+            kwargs['keepalive_timeout'] = keepalive_timeout
+
+        connector: aiohttp.BaseConnector
+        if self.unix_socket is not None:
+            connector = aiohttp.UnixConnector(path=self.unix_socket, **kwargs)
+        else:
+            connector = aiohttp.TCPConnector(**kwargs)
+
+        self.session = aiohttp.ClientSession(connector=connector)
 
     async def close(self) -> None:
         if not self.closed:
@@ -71,5 +92,15 @@ class Response(AbstractResponse[aiohttp.ClientResponse]):
     async def json(self, **kwargs: Any) -> Any:
         return await self.original.json(**kwargs)
 
+    async def read(self) -> bytes:
+        return await self.original.read()
+
     async def text(self, **kwargs: Any) -> Any:
         return await self.original.text(**kwargs)
+
+    async def iter_bytes(self, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        async for chunk in self.original.content.iter_chunked(chunk_size):
+            yield chunk
+
+    def close(self) -> None:
+        self.original.release()
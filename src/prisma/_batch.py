@@ -0,0 +1,194 @@
+import threading
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from .errors import PrismaError, RecordNotFoundError
+
+
+__all__ = (
+    'BatchResult',
+    'BatchProgress',
+    'BatchProgressTracker',
+    'BatchNotCommittedError',
+    'chunk_queries',
+)
+
+T = TypeVar('T')
+
+_UNSET: Any = object()
+
+
+class BatchNotCommittedError(PrismaError):
+    def __init__(self) -> None:
+        super().__init__(
+            'The result of a batched query is not available until the batch has been committed.'
+        )
+
+
+class BatchResult(Generic[T]):
+    """The result of a single query that has been added to a batch.
+
+    The result is available once the batch has been committed, if the query
+    failed then accessing the result will raise the error.
+    """
+
+    __slots__ = ('_parser', '_optional', '_value', '_error')
+
+    def __init__(self, parser: Callable[[Any], T], *, optional: bool = False) -> None:
+        self._parser = parser
+        self._optional = optional
+        self._value: T = _UNSET
+        self._error: Optional[BaseException] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether or not the batch containing this query has been committed"""
+        return self._error is not None or self._value is not _UNSET
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """The error raised by the query, if any"""
+        return self._error
+
+    @property
+    def result(self) -> T:
+        if self._error is not None:
+            raise self._error
+
+        if self._value is _UNSET:
+            raise BatchNotCommittedError()
+
+        return self._value
+
+    def _resolve(self, response: Any) -> Any:
+        """Resolve this result from the query engine response for this query.
+
+        Returns the parsed result or the error if the query failed.
+        """
+        if isinstance(response, BaseException):
+            if self._optional and isinstance(response, RecordNotFoundError):
+                self._value = None  # type: ignore[assignment]
+                return None
+
+            return self._fail(response)
+
+        try:
+            self._value = self._parser(response['data']['result'])
+        except Exception as exc:  # pylint: disable=broad-except
+            return self._fail(exc)
+
+        return self._value
+
+    def _fail(self, error: BaseException) -> BaseException:
+        self._error = error
+        return error
+
+    def __repr__(self) -> str:
+        if self._error is not None:
+            return f'BatchResult(error={self._error!r})'
+
+        if self._value is _UNSET:
+            return 'BatchResult(<pending>)'
+
+        return f'BatchResult({self._value!r})'
+
+
+class BatchProgress(NamedTuple):
+    chunk: int
+    chunks: int
+    size: int
+    completed: int
+    total: int
+    duration: float
+
+
+ProgressCallback = Callable[[BatchProgress], None]
+
+
+class BatchProgressTracker:
+    """Records the progress of a batch that is sent in chunks.
+
+    Chunks may complete from multiple threads at once.
+    """
+
+    def __init__(
+        self, *, chunks: int, total: int, callback: Optional[ProgressCallback] = None
+    ) -> None:
+        self.chunks = chunks
+        self.total = total
+        self.completed = 0
+        self.history: List[BatchProgress] = []
+        self._callback = callback
+        self._lock = threading.Lock()
+
+    def record(self, chunk: int, size: int, duration: float) -> BatchProgress:
+        with self._lock:
+            self.completed += size
+            progress = BatchProgress(
+                chunk=chunk,
+                chunks=self.chunks,
+                size=size,
+                completed=self.completed,
+                total=self.total,
+                duration=duration,
+            )
+            self.history.append(progress)
+
+        if self._callback is not None:
+            self._callback(progress)
+
+        return progress
+
+
+def chunk_queries(
+    queries: Sequence[str],
+    *,
+    max_size: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    measure: Optional[Callable[[str], int]] = None,
+) -> List[Tuple[int, int]]:
+    """Split the given queries into `(start, stop)` ranges that each contain at most `max_size`
+    queries and whose serialized size, as given by `measure`, is at most `max_bytes`.
+
+    A query that is larger than `max_bytes` by itself is given its own chunk.
+    """
+    if max_bytes is not None and measure is None:
+        raise TypeError('The measure argument is required when max_bytes is given.')
+
+    total = len(queries)
+    if max_bytes is None:
+        if max_size is None or total <= max_size:
+            return [(0, total)] if total else []
+
+        return [
+            (start, min(start + max_size, total)) for start in range(0, total, max_size)
+        ]
+
+    ranges: List[Tuple[int, int]] = []
+    start = 0
+    nbytes = 0
+    for index, query in enumerate(queries):
+        size = measure(query)  # type: ignore[misc]
+        count = index - start
+        if count and (
+            (max_size is not None and count >= max_size) or nbytes + size > max_bytes
+        ):
+            ranges.append((start, index))
+            start = index
+            nbytes = 0
+
+        nbytes += size
+
+    if start < total:
+        ranges.append((start, total))
+
+    return ranges
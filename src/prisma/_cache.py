@@ -0,0 +1,219 @@
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Mapping, NamedTuple, Optional, Set, Tuple
+
+from ._types import TypedDict
+
+
+__all__ = (
+    'CacheConfig',
+    'CacheStats',
+    'QueryCache',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+Token = Tuple[int, int]
+
+
+class CacheConfig(TypedDict, total=False):
+    # seconds that results are cached for, defaults to 60
+    ttl: float
+
+    # seconds that results are cached for by model, 0 disables caching for that model
+    model_ttls: Dict[str, float]
+
+    # maximum number of results that are cached, defaults to 1024
+    max_entries: int
+
+    # maximum combined size of the cached results in bytes
+    max_size: int
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    hit_rate: float
+    entries: int
+    size: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+
+class _Entry:
+    __slots__ = ('data', 'model', 'size', 'expires_at')
+
+    def __init__(self, data: str, model: str, size: int, expires_at: float) -> None:
+        self.data = data
+        self.model = model
+        self.size = size
+        self.expires_at = expires_at
+
+
+class QueryCache:
+    """An in-process LRU cache for serialized query results, keyed by the query.
+
+    Results are removed once they have expired, when the cache is full or when the
+    model they are for, or any model related to it, is written to. As deleting or updating
+    a record can affect related records, e.g. through cascading deletes, a write to a model
+    invalidates every model that is related to it, directly or indirectly.
+    """
+
+    def __init__(
+        self,
+        config: CacheConfig,
+        *,
+        relations: Optional[Mapping[str, Iterable[str]]] = None,
+    ) -> None:
+        ttl = config.get('ttl', 60)
+        if ttl < 0:
+            raise ValueError('The cache TTL must be a positive number or 0.')
+
+        model_ttls = config.get('model_ttls') or {}
+        for model, model_ttl in model_ttls.items():
+            if model_ttl < 0:
+                raise ValueError(
+                    f'The cache TTL for {model} must be a positive number or 0.'
+                )
+
+        max_entries = config.get('max_entries', 1024)
+        if max_entries < 1:
+            raise ValueError(
+                'The maximum number of cache entries must be a positive integer.'
+            )
+
+        max_size = config.get('max_size')
+        if max_size is not None and max_size < 1:
+            raise ValueError('The maximum cache size must be a positive integer.')
+
+        self.ttl = ttl
+        self.model_ttls = model_ttls
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._keys: Dict[str, Set[str]] = {}
+        self._relations = {
+            model: set(related) for model, related in (relations or {}).items()
+        }
+        self._affected: Dict[str, Set[str]] = {}
+        self._generations: Dict[str, int] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def is_cacheable(self, model: str) -> bool:
+        return self.model_ttls.get(model, self.ttl) > 0
+
+    def token(self, model: str) -> Token:
+        """Returns a token that must be passed to `set()` for a result that is about to be queried.
+
+        Results are not cached if the model was invalidated while they were being queried.
+        """
+        with self._lock:
+            return self._generation, self._generations.get(model, 0)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.data
+
+    def set(self, key: str, model: str, data: str, token: Token) -> None:
+        size = len(key) + len(data)
+        if self.max_size is not None and size > self.max_size:
+            return
+
+        with self._lock:
+            if token != (self._generation, self._generations.get(model, 0)):
+                log.debug(
+                    'Not caching result for %s as it was invalidated while being queried',
+                    model,
+                )
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            ttl = self.model_ttls.get(model, self.ttl)
+            self._entries[key] = _Entry(data, model, size, time.monotonic() + ttl)
+            self._keys.setdefault(model, set()).add(key)
+            self.size += size
+
+            while len(self._entries) > self.max_entries or (
+                self.max_size is not None and self.size > self.max_size
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, models: Iterable[str]) -> None:
+        """Remove the results for the given models and every model that is related to them"""
+        with self._lock:
+            for model in models:
+                for affected in self._get_affected(model):
+                    self._generations[affected] = self._generations.get(affected, 0) + 1
+                    for key in list(self._keys.get(affected, ())):
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys.clear()
+            self.size = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return CacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                hit_rate=self.hits / lookups if lookups else 0.0,
+                entries=len(self._entries),
+                size=self.size,
+                evictions=self.evictions,
+                expirations=self.expirations,
+                invalidations=self.invalidations,
+            )
+
+    def _get_affected(self, model: str) -> Set[str]:
+        # NOTE: the lock must be held when calling this method
+        affected = self._affected.get(model)
+        if affected is None:
+            affected = {model}
+            pending = [model]
+            while pending:
+                for related in self._relations.get(pending.pop(), ()):
+                    if related not in affected:
+                        affected.add(related)
+                        pending.append(related)
+
+            self._affected[model] = affected
+
+        return affected
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+        keys = self._keys.get(entry.model)
+        if keys is not None:
+            keys.discard(key)
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+
+__all__ = ('QueryCoalescer',)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+BatchSender = Callable[[List[str]], Awaitable[List[Any]]]
+
+
+class QueryCoalescer:
+    """Collects queries that are executed within a short window and sends them in a single batch.
+
+    By default queries are collected until the current iteration of the event loop has
+    finished, `window` can be used to wait for a number of seconds instead.
+
+    The sender is given every query in the batch and must return a result for each
+    query, results that are exceptions are raised to the caller of that query.
+    """
+
+    def __init__(
+        self, send: BatchSender, *, window: float = 0, max_size: int = 1000
+    ) -> None:
+        if window < 0:
+            raise ValueError('The coalescing window must be a positive number or 0.')
+
+        if max_size < 1:
+            raise ValueError('The maximum batch size must be a positive integer.')
+
+        self.window = window
+        self.max_size = max_size
+        self._send = send
+        self._pending: List[Tuple[str, 'asyncio.Future[Any]']] = []
+        self._handle: Optional[asyncio.Handle] = None
+
+    async def execute(self, query: str) -> Any:
+        loop = asyncio.get_event_loop()
+        future: 'asyncio.Future[Any]' = loop.create_future()
+        self._pending.append((query, future))
+
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._handle is None:
+            if self.window:
+                self._handle = loop.call_later(self.window, self._flush)
+            else:
+                self._handle = loop.call_soon(self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        pending = self._pending
+        self._pending = []
+        if pending:
+            log.debug('Sending %i coalesced queries', len(pending))
+            asyncio.ensure_future(self._dispatch(pending))
+
+    async def _dispatch(self, pending: List[Tuple[str, 'asyncio.Future[Any]']]) -> None:
+        try:
+            results = await self._send([query for query, _ in pending])
+        except Exception as exc:  # pylint: disable=broad-except
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        if len(results) != len(pending):
+            error = RuntimeError(
+                f'Expected {len(pending)} results but received {len(results)}'
+            )
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_, future), result in zip(pending, results):
+            # the caller may have been cancelled while waiting
+            if future.done():
+                continue
+
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,75 @@
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, cast
+
+from ._types import Literal
+
+
+__all__ = ('ColumnFormat', 'ColumnBuilder')
+
+ColumnFormat = Literal['list', 'numpy', 'arrow']
+Converter = Callable[[Any], Any]
+
+
+class ColumnBuilder:
+    """Transposes query engine records into a mapping of field name to column.
+
+    Records are added one at a time so that they can be discarded as soon as they
+    have been added, e.g. while a response is being streamed.
+
+    The format of each column can be one of:
+
+    - list: builtin lists
+    - numpy: NumPy arrays, requires numpy to be installed
+    - arrow: PyArrow arrays, requires pyarrow to be installed
+    """
+
+    def __init__(
+        self,
+        fields: List[str],
+        converters: Mapping[str, Converter],
+        format: ColumnFormat = 'list',  # pylint: disable=redefined-builtin
+    ) -> None:
+        # resolve the format before any records are added so that
+        # missing libraries are reported before a query is sent
+        self._finalize = _get_finalizer(format)
+        self._columns: Dict[str, List[Any]] = {field: [] for field in fields}
+        self._appenders: List[
+            Tuple[str, Callable[[Any], None], Optional[Converter]]
+        ] = [
+            (field, column.append, converters.get(field))
+            for field, column in self._columns.items()
+        ]
+
+    def append(self, record: Mapping[str, Any]) -> None:
+        for field, append, converter in self._appenders:
+            value = record[field]
+            if converter is not None and value is not None:
+                value = converter(value)
+            append(value)
+
+    def build(self) -> Dict[str, Any]:
+        finalize = self._finalize
+        if finalize is None:
+            return self._columns
+
+        return {field: finalize(column) for field, column in self._columns.items()}
+
+
+def _get_finalizer(format: ColumnFormat) -> Optional[Callable[[List[Any]], Any]]:
+    # pylint: disable=redefined-builtin
+    # numpy and pyarrow are optional dependencies and may not be installed
+    if format == 'list':
+        return None
+
+    if format == 'numpy':
+        import numpy  # pyright: ignore[reportMissingImports]
+
+        return cast(Callable[[List[Any]], Any], numpy.array)
+
+    if format == 'arrow':
+        import pyarrow  # pyright: ignore[reportMissingImports, reportMissingTypeStubs]
+
+        return cast(Callable[[List[Any]], Any], pyarrow.array)
+
+    raise ValueError(
+        f'Unknown column format: {format}, must be one of list, numpy, arrow'
+    )
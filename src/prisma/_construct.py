@@ -0,0 +1,98 @@
+import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, cast
+
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
+from pydantic.datetime_parse import parse_datetime as pydantic_parse_datetime
+
+from ._types import BaseModelT
+
+
+__all__ = ('get_constructor', 'parse_datetime', 'list_converter')
+
+Converter = Callable[[Any], Any]
+Constructor = Callable[[Dict[str, Any]], BaseModelT]
+
+
+def parse_datetime(value: Any) -> datetime.datetime:
+    if isinstance(value, datetime.datetime):
+        return value
+
+    # the query engine always returns RFC 3339 strings which the
+    # standard library can parse much faster than pydantic can
+    try:
+        return datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, TypeError, ValueError):
+        return pydantic_parse_datetime(value)
+
+
+SCALAR_CONVERTERS: Dict[Any, Converter] = {
+    datetime.datetime: parse_datetime,
+    float: float,
+    # BigInt values may be returned as strings
+    int: int,
+}
+
+
+def get_constructor(model: Type[BaseModelT]) -> 'Constructor[BaseModelT]':
+    """Returns a function for creating the given model from query engine data without validation.
+
+    As the query engine has already validated the data, only the values that are returned in a
+    different format to what the model expects are converted, e.g. DateTime strings and relational
+    fields, everything else is passed through to `BaseModel.construct()` as is.
+    """
+    # lru_cache erases the type of the model so it is restored here
+    return cast('Constructor[BaseModelT]', _get_constructor(model))
+
+
+@lru_cache(maxsize=None)
+def _get_constructor(model: Type[BaseModel]) -> 'Constructor[BaseModel]':
+    converters: List[Tuple[str, Converter]] = []
+    for name, field in model.__fields__.items():
+        converter = _get_converter(field.type_)
+        if converter is None:
+            continue
+
+        if field.shape == SHAPE_LIST:
+            converter = list_converter(converter)
+        elif field.shape != SHAPE_SINGLETON:
+            # this should never happen for models generated by Prisma
+            continue  # pragma: no cover
+
+        converters.append((name, converter))
+
+    construct = model.construct
+
+    def constructor(data: Dict[str, Any]) -> BaseModel:
+        values = data.copy()
+        for name, converter in converters:
+            value = values.get(name)
+            if value is not None:
+                values[name] = converter(value)
+
+        return construct(**values)
+
+    return constructor
+
+
+def _get_converter(type_: Any) -> Optional[Converter]:
+    if isinstance(type_, type) and issubclass(type_, BaseModel):
+        return _model_converter(type_)
+
+    return SCALAR_CONVERTERS.get(type_)
+
+
+def _model_converter(model: Type[BaseModel]) -> Converter:
+    # the constructor is resolved lazily as models can reference each other
+    def converter(value: Any) -> Any:
+        return _get_constructor(model)(value)
+
+    return converter
+
+
+def list_converter(converter: Converter) -> Converter:
+    def convert_list(value: Any) -> Any:
+        return [converter(item) for item in value]
+
+    return convert_list
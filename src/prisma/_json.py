@@ -0,0 +1,246 @@
+import re
+import json
+import codecs
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Type, Union
+
+
+__all__ = (
+    'JSONBackend',
+    'StdlibJSON',
+    'OrjsonJSON',
+    'UjsonJSON',
+    'get_backend',
+    'ResultStreamDecoder',
+)
+
+DefaultFunc = Callable[[Any], Any]
+
+
+class JSONBackend(ABC):
+    """Interface for encoding requests to and decoding responses from the query engine.
+
+    Implementations must call the `default` function for any type that they
+    cannot natively serialize *including* datetime objects, this is required
+    as the query engine expects every datetime to be in UTC.
+    """
+
+    @abstractmethod
+    def dumps(self, obj: Any, *, default: DefaultFunc) -> str:
+        ...
+
+    @abstractmethod
+    def loads(self, data: Union[str, bytes]) -> Any:
+        ...
+
+    @property
+    @abstractmethod
+    def library(self) -> str:
+        ...
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def __str__(self) -> str:
+        return f'<JSONBackend library={self.library}>'
+
+
+class StdlibJSON(JSONBackend):
+    def dumps(self, obj: Any, *, default: DefaultFunc) -> str:
+        # these are the arguments the query builder has always encoded queries with,
+        # changing them would change the bytes of every query that is sent
+        return json.dumps(obj, default=default, ensure_ascii=False)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    @property
+    def library(self) -> str:
+        return 'json'
+
+
+class OrjsonJSON(JSONBackend):
+    def __init__(self) -> None:
+        # orjson and ujson are optional dependencies and may not be installed
+        import orjson  # pyright: ignore[reportMissingImports]
+
+        self._orjson = orjson
+
+        # orjson natively serializes datetimes, we want to
+        # handle them ourselves to ensure they are in UTC
+        self._option = orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj: Any, *, default: DefaultFunc) -> str:
+        data: bytes = self._orjson.dumps(obj, default=default, option=self._option)
+        return data.decode('utf-8')
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._orjson.loads(data)
+
+    @property
+    def library(self) -> str:
+        return 'orjson'
+
+
+class UjsonJSON(JSONBackend):
+    def __init__(self) -> None:
+        import ujson  # pyright: ignore[reportMissingImports, reportMissingTypeStubs]
+
+        self._ujson = ujson
+
+    def dumps(self, obj: Any, *, default: DefaultFunc) -> str:
+        data: str = self._ujson.dumps(
+            obj,
+            default=default,
+            ensure_ascii=False,
+            escape_forward_slashes=False,
+        )
+        return data
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._ujson.loads(data)
+
+    @property
+    def library(self) -> str:
+        return 'ujson'
+
+
+BACKENDS: Dict[str, Type[JSONBackend]] = {
+    'stdlib': StdlibJSON,
+    'orjson': OrjsonJSON,
+    'ujson': UjsonJSON,
+}
+
+
+@lru_cache(maxsize=None)
+def get_backend(name: str) -> JSONBackend:
+    """Returns the JSON backend with the given name.
+
+    Raises ImportError if the backend library is not installed.
+    """
+    try:
+        backend = BACKENDS[name]
+    except KeyError as exc:
+        raise ValueError(
+            f'Unknown JSON backend: {name}, must be one of {", ".join(BACKENDS)}'
+        ) from exc
+
+    return backend()
+
+
+# matches the start of a successful query engine response, e.g. `{"data":{"result":[`
+RESULT_PREFIX_RE = re.compile(r'\s*\{\s*"data"\s*:\s*\{\s*"result"\s*:\s*\[')
+RESULT_SUFFIX_RE = re.compile(r'\s*\}\s*\}\s*')
+WHITESPACE_RE = re.compile(r'\s*')
+
+# matches a number that may continue in the next chunk, e.g. `-2500.` or `1e`
+PARTIAL_NUMBER_RE = re.compile(r'-?\d+(?:\.\d*)?(?:[eE][+-]?\d*)?')
+
+# the prefix we are looking for is much shorter than this, if we've buffered
+# this many characters without finding it then the response is something else
+MAX_PREFIX_SIZE = 256
+
+
+class ResultStreamDecoder:
+    """Incrementally decodes the items of the `data.result` array of a query engine response.
+
+    Chunks of the raw response body are passed to `feed()` which returns every array item
+    that has been fully received so far, only the current partial item is kept in memory.
+
+    If the response does not start with a `data.result` array, e.g. the query engine
+    returned errors, the entire body is buffered and returned by `close()` instead.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._state = 'prefix'
+        self._expecting_item = True
+        self._empty = True
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        self._buffer += self._decoder.decode(chunk)
+        return self._process()
+
+    def close(self) -> Optional[Any]:
+        """Signal the end of the response.
+
+        Returns the decoded response if it was not streamed, otherwise None.
+        """
+        self._buffer += self._decoder.decode(b'', final=True)
+        state = self._state
+        if state == 'prefix' or state == 'buffered':
+            return json.loads(self._buffer)
+
+        if state == 'items':
+            raise ValueError('Response ended before the result array was closed')
+
+        if not RESULT_SUFFIX_RE.fullmatch(self._buffer):
+            raise ValueError(
+                f'Unexpected data after the result array: {self._buffer[:50]!r}'
+            )
+
+        return None
+
+    def _process(self) -> List[Any]:
+        if self._state == 'prefix':
+            match = RESULT_PREFIX_RE.match(self._buffer)
+            if match is None:
+                if len(self._buffer) >= MAX_PREFIX_SIZE or '[' in self._buffer:
+                    self._state = 'buffered'
+                return []
+
+            self._state = 'items'
+            self._buffer = self._buffer[match.end() :]
+
+        if self._state != 'items':
+            return []
+
+        items: List[Any] = []
+        buffer = self._buffer
+        pos = 0
+        end = len(buffer)
+
+        while True:
+            pos = WHITESPACE_RE.match(buffer, pos).end()  # type: ignore[union-attr]
+            if pos >= end:
+                break
+
+            char = buffer[pos]
+            if self._expecting_item:
+                if char == ']' and self._empty:
+                    self._state = 'suffix'
+                    pos += 1
+                    break
+
+                try:
+                    item, item_end = self._json.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # the item has not been fully received yet
+                    break
+
+                # scalars are only complete once they are followed by a separator, e.g. `-2500`
+                # could be decoded from `-2500.` when the rest of the number is in the next chunk
+                if not isinstance(item, (dict, list)):
+                    next_pos = WHITESPACE_RE.match(buffer, item_end).end()  # type: ignore[union-attr]
+                    if next_pos >= end or PARTIAL_NUMBER_RE.fullmatch(buffer, pos, end):
+                        break
+
+                items.append(item)
+                pos = item_end
+                self._empty = False
+                self._expecting_item = False
+            elif char == ',':
+                pos += 1
+                self._expecting_item = True
+            elif char == ']':
+                self._state = 'suffix'
+                pos += 1
+                break
+            else:
+                raise ValueError(f'Unexpected character in the result array: {char!r}')
+
+        self._buffer = buffer[pos:]
+        return items
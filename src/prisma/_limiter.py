@@ -0,0 +1,326 @@
+import time
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import deque
+from types import TracebackType
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from ._types import Literal
+from .errors import QueryQueueTimeoutError
+
+
+__all__ = (
+    'Priority',
+    'QueueStats',
+    'PriorityStats',
+    'ConcurrencyLimiter',
+    'query_priority',
+    'get_query_priority',
+    'query_queue_timeout',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+Priority = Literal['high', 'normal', 'low']
+
+# every priority class, from the highest priority to the lowest
+PRIORITIES: Tuple[Priority, ...] = ('high', 'normal', 'low')
+
+_UNSET: Any = object()
+
+_priority: ContextVar[Priority] = ContextVar('prisma_query_priority', default='normal')
+_queue_timeout: ContextVar[Any] = ContextVar(
+    'prisma_query_queue_timeout', default=_UNSET
+)
+
+
+@contextmanager
+def query_priority(priority: Priority) -> Iterator[None]:
+    """Send every query that is made within the block with the given priority class"""
+    if priority not in PRIORITIES:
+        raise ValueError(
+            f'Unknown query priority: {priority}, must be one of {", ".join(PRIORITIES)}'
+        )
+
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def get_query_priority() -> Priority:
+    """Returns the priority class that queries are currently sent with"""
+    return _priority.get()
+
+
+@contextmanager
+def query_queue_timeout(timeout: Optional[float]) -> Iterator[None]:
+    """Override the maximum number of seconds that every query made within the block can wait in the queue.
+
+    None means that queries wait until they can be sent.
+    """
+    if timeout is not None and timeout < 0:
+        raise ValueError('The maximum queue wait must be a positive number or 0.')
+
+    token = _queue_timeout.set(timeout)
+    try:
+        yield
+    finally:
+        _queue_timeout.reset(token)
+
+
+class PriorityStats(NamedTuple):
+    limit: Optional[int]
+    in_flight: int
+    queued: int
+    requests: int
+    waits: int
+    average_wait: float
+    max_wait: float
+
+
+class QueueStats(NamedTuple):
+    limit: Optional[int]
+    in_flight: int
+    queued: int
+    max_queued: int
+    requests: int
+    waits: int
+    timeouts: int
+    average_wait: float
+    max_wait: float
+    priorities: Dict[str, PriorityStats]
+
+
+class _PriorityClass:
+    def __init__(self, limit: Optional[int]) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self.requests = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.waiters: Deque['asyncio.Future[None]'] = deque()
+
+    @property
+    def full(self) -> bool:
+        return self.limit is not None and self.in_flight >= self.limit
+
+    def stats(self) -> PriorityStats:
+        waits = self.waits
+        return PriorityStats(
+            limit=self.limit,
+            in_flight=self.in_flight,
+            queued=len(self.waiters),
+            requests=self.requests,
+            waits=waits,
+            average_wait=self.total_wait / waits if waits else 0.0,
+            max_wait=self.max_wait,
+        )
+
+
+class ConcurrencyLimiter:
+    """Limits the number of requests that are in flight at the same time.
+
+    Requests that are made while the limit is reached wait in a queue for their priority class,
+    when a request finishes the oldest request with the highest priority is sent next. The number
+    of requests in flight for a priority class can be capped with `priority_limits`.
+
+    If `timeout` is given then requests that have waited for that many seconds
+    fail with `QueryQueueTimeoutError` instead of continuing to wait.
+
+    If `limit` is None then requests only wait if their priority class is capped.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        *,
+        timeout: Optional[float] = None,
+        priority_limits: Optional[Mapping[Priority, int]] = None,
+    ) -> None:
+        if limit is not None and limit < 1:
+            raise ValueError('The maximum concurrency must be a positive integer.')
+
+        if timeout is not None and timeout < 0:
+            raise ValueError('The maximum queue wait must be a positive number or 0.')
+
+        priority_limits = priority_limits or {}
+        for priority, priority_limit in priority_limits.items():
+            if priority not in PRIORITIES:
+                raise ValueError(
+                    f'Unknown query priority: {priority}, must be one of {", ".join(PRIORITIES)}'
+                )
+
+            if priority_limit < 1:
+                raise ValueError(
+                    f'The concurrency limit for {priority} priority queries must be a positive integer.'
+                )
+
+        self.limit = limit
+        self.timeout = timeout
+        self.in_flight = 0
+        self.max_queued = 0
+        self.timeouts = 0
+        self._classes = {
+            priority: _PriorityClass(priority_limits.get(priority))
+            for priority in PRIORITIES
+        }
+
+    @property
+    def queued(self) -> int:
+        return sum(len(cls.waiters) for cls in self._classes.values())
+
+    def stats(self) -> QueueStats:
+        classes = self._classes.values()
+        waits = sum(cls.waits for cls in classes)
+        return QueueStats(
+            limit=self.limit,
+            in_flight=self.in_flight,
+            queued=self.queued,
+            max_queued=self.max_queued,
+            requests=sum(cls.requests for cls in classes),
+            waits=waits,
+            timeouts=self.timeouts,
+            average_wait=sum(cls.total_wait for cls in classes) / waits
+            if waits
+            else 0.0,
+            max_wait=max(cls.max_wait for cls in classes),
+            priorities={
+                priority: cls.stats() for priority, cls in self._classes.items()
+            },
+        )
+
+    def slot(self, priority: Optional[Priority] = None) -> '_Slot':
+        """Returns a context manager that holds a slot while a request is in flight.
+
+        Defaults to the priority class set with `query_priority()` and the
+        timeout set with `query_queue_timeout()`.
+        """
+        timeout = _queue_timeout.get()
+        if timeout is _UNSET:
+            timeout = self.timeout
+        return _Slot(self, priority or _priority.get(), timeout)
+
+    async def acquire(
+        self, priority: Priority, timeout: Optional[float] = _UNSET
+    ) -> None:
+        if timeout is _UNSET:
+            timeout = self.timeout
+
+        cls = self._classes[priority]
+
+        # requests cannot skip ahead of requests in the same priority class that are already waiting,
+        # waiting requests with a higher priority would have already been sent if they could be
+        if not self._full and not cls.full and not cls.waiters:
+            self._take(cls)
+            return
+
+        loop = asyncio.get_event_loop()
+        future: 'asyncio.Future[None]' = loop.create_future()
+        cls.waiters.append(future)
+        self.max_queued = max(self.max_queued, self.queued)
+
+        handle: Optional[asyncio.TimerHandle] = None
+        if timeout is not None:
+            handle = loop.call_later(timeout, self._expire, cls, future, timeout)
+
+        start = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # the slot was given to us after we were cancelled
+                self.release(priority)
+            else:
+                self._remove(cls, future)
+            raise
+        finally:
+            if handle is not None:
+                handle.cancel()
+
+        waited = time.monotonic() - start
+        cls.waits += 1
+        cls.total_wait += waited
+        cls.max_wait = max(cls.max_wait, waited)
+
+    def release(self, priority: Priority) -> None:
+        self.in_flight -= 1
+        self._classes[priority].in_flight -= 1
+        self._dispatch()
+
+    @property
+    def _full(self) -> bool:
+        return self.limit is not None and self.in_flight >= self.limit
+
+    def _take(self, cls: _PriorityClass) -> None:
+        self.in_flight += 1
+        cls.in_flight += 1
+        cls.requests += 1
+
+    def _dispatch(self) -> None:
+        # give the free slots to the oldest waiting requests with the highest priority
+        while not self._full:
+            for cls in self._classes.values():
+                if cls.waiters and not cls.full:
+                    future = cls.waiters.popleft()
+                    if not future.done():
+                        self._take(cls)
+                        future.set_result(None)
+                    break
+            else:
+                return
+
+    def _expire(
+        self, cls: _PriorityClass, future: 'asyncio.Future[None]', timeout: float
+    ) -> None:
+        if future.done():
+            return
+
+        self._remove(cls, future)
+        self.timeouts += 1
+        log.debug('Request timed out after waiting %ss for a slot', timeout)
+        future.set_exception(QueryQueueTimeoutError(timeout))
+
+    def _remove(self, cls: _PriorityClass, future: 'asyncio.Future[None]') -> None:
+        try:
+            cls.waiters.remove(future)
+        except ValueError:
+            pass
+
+
+class _Slot:
+    limiter: ConcurrencyLimiter
+    priority: Priority
+    timeout: Optional[float]
+
+    def __init__(
+        self, limiter: ConcurrencyLimiter, priority: Priority, timeout: Optional[float]
+    ) -> None:
+        self.limiter = limiter
+        self.priority = priority
+        self.timeout = timeout
+
+    async def __aenter__(self) -> None:
+        await self.limiter.acquire(self.priority, self.timeout)
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.limiter.release(self.priority)
@@ -1,7 +1,11 @@
 import shutil
-from typing import Any
+import socket
+from typing import Any, Iterator, Optional
 
 import requests
+from requests.adapters import HTTPAdapter, DEFAULT_POOLSIZE
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
 
 from ._types import Method
 from .http_abstract import AbstractResponse, AbstractHTTP
@@ -22,8 +26,25 @@ class HTTP(AbstractHTTP[requests.Session, requests.Response]):
     def request(self, method: Method, url: str, **kwargs: Any) -> 'Response':
         return Response(self.session.request(method, url, **kwargs))
 
+    def stream(self, method: Method, url: str, **kwargs: Any) -> 'Response':
+        return Response(self.session.request(method, url, stream=True, **kwargs))
+
     def open(self) -> None:
-        self.session = requests.Session()
+        session = requests.Session()
+
+        # keepalive_timeout is not supported by requests
+        pool_size = self.config.get('pool_size', DEFAULT_POOLSIZE)
+
+        adapter: Optional[HTTPAdapter] = None
+        if self.unix_socket is not None:
+            adapter = UnixSocketAdapter(self.unix_socket, pool_maxsize=pool_size)
+        elif pool_size != DEFAULT_POOLSIZE:
+            adapter = HTTPAdapter(pool_maxsize=pool_size)
+
+        if adapter is not None:
+            session.mount('http://', adapter)
+
+        self.session = session
 
     def close(self) -> None:
         if not self.closed:
@@ -49,5 +70,60 @@ class Response(AbstractResponse[requests.Response]):
     def json(self) -> Any:
         return self.original.json()
 
+    def read(self) -> bytes:
+        return self.original.content
+
     def text(self) -> Any:
         return self.original.text
+
+    def iter_bytes(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        return self.original.iter_content(chunk_size)
+
+    def close(self) -> None:
+        self.original.close()
+
+
+class UnixSocketConnection(HTTPConnection):
+    def __init__(self, *args: Any, socket_path: str, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+
+        sock.connect(self.socket_path)
+        return sock
+
+
+class UnixSocketAdapter(HTTPAdapter):
+    """Sends every request over the given Unix domain socket, the host of the URL is ignored"""
+
+    def __init__(
+        self, path: str, pool_maxsize: int = DEFAULT_POOLSIZE, **kwargs: Any
+    ) -> None:
+        super().__init__(pool_maxsize=pool_maxsize, **kwargs)
+        self._pool = UnixSocketConnectionPool(path, maxsize=pool_maxsize)
+
+    # pylint: disable=unused-argument
+    def get_connection(self, url: str, proxies: Any = None) -> HTTPConnectionPool:
+        return self._pool
+
+    # requests >= 2.32.2 uses this method instead of get_connection()
+    def get_connection_with_tls_context(
+        self, request: Any, verify: Any, proxies: Any = None, cert: Any = None
+    ) -> HTTPConnectionPool:
+        return self._pool
+
+    def close(self) -> None:
+        super().close()  # type: ignore[no-untyped-call]
+        self._pool.close()
+
+
+class UnixSocketConnectionPool(HTTPConnectionPool):
+    ConnectionCls = UnixSocketConnection
+
+    def __init__(self, path: str, **kwargs: Any) -> None:
+        # extra keyword arguments are passed to the connection class
+        super().__init__('localhost', socket_path=path, **kwargs)
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+
+
+__all__ = (
+    'SingleFlight',
+    'SingleFlightStats',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+class SingleFlightStats(NamedTuple):
+    requests: int
+    deduplicated: int
+    in_flight: int
+
+
+class SingleFlight:
+    """Shares the result of a request with every identical request that is made while it is in flight.
+
+    The request is sent in a separate task so that cancelling the caller that made the request does
+    not cancel it for every other caller. As the result is shared, `copy` is called to create the
+    result that is given to each caller that did not make the request.
+    """
+
+    def __init__(self, *, copy: Optional[Callable[[Any], Any]] = None) -> None:
+        self.requests = 0
+        self.deduplicated = 0
+        self._copy = copy
+        self._in_flight: Dict[str, 'asyncio.Future[Any]'] = {}
+
+    async def execute(self, key: str, send: Callable[[], Awaitable[Any]]) -> Any:
+        self.requests += 1
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.deduplicated += 1
+            log.debug('Waiting for an identical query that is already in flight')
+            result = await asyncio.shield(future)
+            if self._copy is not None:
+                return self._copy(result)
+            return result
+
+        future = asyncio.ensure_future(send())
+        self._in_flight[key] = future
+        future.add_done_callback(lambda f: self._on_done(key, f))
+        return await asyncio.shield(future)
+
+    def forget(self) -> None:
+        """Send the next request for every key, even if an identical request is in flight"""
+        self._in_flight.clear()
+
+    def stats(self) -> SingleFlightStats:
+        return SingleFlightStats(
+            requests=self.requests,
+            deduplicated=self.deduplicated,
+            in_flight=len(self._in_flight),
+        )
+
+    def _on_done(self, key: str, future: 'asyncio.Future[Any]') -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+        # every caller may have been cancelled, this avoids a
+        # warning that the exception was never retrieved
+        if not future.cancelled():
+            future.exception()
@@ -2,12 +2,13 @@
 
 import logging
 from pathlib import Path
-from typing import Optional, List
+from typing import List
 
 import click
 
 from .binary import Binary
 from .engine import Engine
+from .utils import download_many
 from .constants import GLOBAL_TEMP_DIR, PRISMA_CLI_NAME
 
 
@@ -47,19 +48,24 @@ def ensure_cached() -> Path:
         log.debug('All binaries are cached')
         return GLOBAL_TEMP_DIR
 
-    def show_item(item: Optional[Binary]) -> str:
-        if item is not None:
-            return binary.name
-        return ''
+    names = {str(binary.path.absolute()): binary.name for binary in binaries}
 
+    # the progress bar is updated as each download completes instead of by iterating over it
     with click.progressbar(
         binaries,
         label='Downloading binaries',
         fill_char=click.style('#', fg='yellow'),
-        item_show_func=show_item,
-    ) as iterator:
-        for binary in iterator:
-            binary.download()
+    ) as bar:
+
+        def on_complete(dest: str) -> None:
+            log.debug('Downloaded %s to %s', names[dest], dest)
+            bar.update(1)
+
+        # binaries are downloaded concurrently
+        download_many(
+            [(binary.url, str(binary.path.absolute())) for binary in binaries],
+            on_complete=on_complete,
+        )
 
     return GLOBAL_TEMP_DIR
 
@@ -1,9 +1,22 @@
+import os
 import re
 import sys
+import json
+import shutil
+import logging
 import subprocess
 import platform as _platform
+from pathlib import Path
 from functools import lru_cache
-from typing import Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+OS_RELEASE_FILES = ('/etc/os-release', '/usr/lib/os-release')
+
+# overrides where the detected platform is persisted, defaults to the binaries directory
+CACHE_FILE: Optional[Path] = None
 
 
 def name() -> str:
@@ -32,15 +45,26 @@ def linux_distro() -> str:
 
 
 def _get_linux_distro_details() -> Tuple[str, str]:
-    process = subprocess.run(
-        ['cat', '/etc/os-release'], stdout=subprocess.PIPE, check=True
-    )
-    output = str(process.stdout, sys.getdefaultencoding())
+    path = _find_os_release()
+    if path is None:
+        return '', ''
+
+    return parse_os_release(path.read_text())
 
-    match = re.search(r'ID="?([^"\n]*)"?', output)
+
+def _find_os_release() -> Optional[Path]:
+    for file in OS_RELEASE_FILES:
+        path = Path(file)
+        if path.exists():
+            return path
+    return None
+
+
+def parse_os_release(string: str) -> Tuple[str, str]:
+    match = re.search(r'^ID="?([^"\n]*)"?', string, re.MULTILINE)
     distro_id = match.group(1) if match else ''  # type: str
 
-    match = re.search(r'ID_LIKE="?([^"\n]*)"?', output)
+    match = re.search(r'^ID_LIKE="?([^"\n]*)"?', string, re.MULTILINE)
     distro_id_like = match.group(1) if match else ''  # type: str
     return distro_id, distro_id_like
 
@@ -51,6 +75,17 @@ def binary_platform() -> str:
     if platform != 'linux':
         return platform
 
+    key = _get_cache_key()
+    cached = _read_cached_platform(key)
+    if cached is not None:
+        return cached
+
+    platform = _detect_linux_platform()
+    _cache_platform(key, platform)
+    return platform
+
+
+def _detect_linux_platform() -> str:
     distro = linux_distro()
     if distro == 'alpine':
         return 'linux-musl'
@@ -60,12 +95,33 @@ def binary_platform() -> str:
 
 
 def get_openssl() -> str:
-    process = subprocess.run(
-        ['openssl', 'version', '-v'], stdout=subprocess.PIPE, check=True
-    )
+    # NOTE: the ssl module is not used first as python distributions may bundle
+    # their own OpenSSL library that differs from the system library that the
+    # query engine is linked against, the detected platform is persisted so
+    # the openssl process is only spawned when the platform is detected
+    try:
+        process = subprocess.run(
+            ['openssl', 'version', '-v'], stdout=subprocess.PIPE, check=True
+        )
+    except (OSError, subprocess.CalledProcessError) as exc:
+        log.debug(
+            'Could not run openssl due to %s, using the version linked by the ssl module',
+            exc,
+        )
+        return parse_openssl_version(_get_ssl_module_version() or '')
+
     return parse_openssl_version(str(process.stdout, sys.getdefaultencoding()))
 
 
+def _get_ssl_module_version() -> Optional[str]:
+    try:
+        import ssl
+    except ImportError:  # pragma: no cover
+        return None
+
+    return ssl.OPENSSL_VERSION
+
+
 def parse_openssl_version(string: str) -> str:
     match = re.match(r'^OpenSSL\s(\d+\.\d+)\.\d+', string)
     if match is None:
@@ -73,3 +129,73 @@ def parse_openssl_version(string: str) -> str:
         return '1.1.x'
 
     return match.group(1) + '.x'
+
+
+def get_cache_file() -> Path:
+    if CACHE_FILE is not None:
+        return CACHE_FILE
+
+    # NOTE: imported here as the constants module depends on this module
+    from .constants import GLOBAL_TEMP_DIR
+
+    return GLOBAL_TEMP_DIR.parent / 'platform.json'
+
+
+def _get_cache_key() -> Dict[str, Any]:
+    # the detected platform depends on the distribution and the OpenSSL version,
+    # both the OpenSSL library that the ssl module is linked against and the
+    # openssl executable are included so that upgrading either invalidates the cache
+    key: Dict[str, Any] = {
+        'executable': sys.executable,
+        'openssl': _get_ssl_module_version(),
+    }
+    path = _find_os_release()
+    if path is not None:
+        key['os_release'] = _file_key(path)
+
+    openssl = shutil.which('openssl')
+    if openssl is not None:
+        key['openssl_executable'] = _file_key(Path(openssl))
+
+    return key
+
+
+def _file_key(path: Path) -> List[Any]:
+    stat = path.stat()
+    return [str(path), stat.st_size, stat.st_mtime_ns]
+
+
+def _read_cache() -> Dict[str, Any]:
+    try:
+        data = json.loads(get_cache_file().read_text())
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict):
+        return {}
+
+    return data
+
+
+def _read_cached_platform(key: Dict[str, Any]) -> Optional[str]:
+    entry = _read_cache().get(sys.executable)
+    if not isinstance(entry, dict) or entry.get('key') != key:
+        return None
+
+    platform = entry.get('platform')
+    return platform if isinstance(platform, str) else None
+
+
+def _cache_platform(key: Dict[str, Any], platform: str) -> None:
+    file = get_cache_file()
+    try:
+        data = _read_cache()
+        data[sys.executable] = {'key': key, 'platform': platform}
+
+        # write to a temporary file first so that other processes never read a partially written cache
+        file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = file.with_name(f'{file.name}.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, file)
+    except OSError as exc:
+        log.debug('Could not persist the detected platform due to %s', exc)
@@ -1,31 +1,160 @@
 import os
-import gzip
-import shutil
+import zlib
+import asyncio
+import threading
 from pathlib import Path
+from types import TracebackType
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Type
 
 from ..http import client
-from ..utils import maybe_async_run
+from ..utils import async_run, is_coroutine
+
+
+__all__ = ('download', 'download_many')
+
+CHUNK_SIZE = 65536
+
+
+class GzipFileWriter:
+    """Decompresses gzipped chunks into a temporary file that replaces the destination once finished.
+
+    The destination is only replaced if every chunk was written successfully.
+    """
+
+    def __init__(self, dest: str) -> None:
+        self.dest = dest
+        self.tmp = f'{dest}.{os.getpid()}.{threading.get_ident()}.tmp'
+        self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        Path(dest).parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.tmp, 'wb')  # pylint: disable=consider-using-with
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(self._decompressor.decompress(chunk))
+
+    def commit(self) -> None:
+        try:
+            self._file.write(self._decompressor.flush())
+            if not self._decompressor.eof:
+                raise EOFError(
+                    'Compressed file ended before the end-of-stream marker was reached'
+                )
+        finally:
+            self._file.close()
+
+        # chmod +x
+        status = os.stat(self.tmp)
+        os.chmod(self.tmp, status.st_mode | 0o111)
+
+        # atomically override the original
+        os.replace(self.tmp, self.dest)
+
+    def abort(self) -> None:
+        self._file.close()
+        try:
+            os.remove(self.tmp)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> 'GzipFileWriter':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        if exc is None:
+            try:
+                self.commit()
+            except BaseException:
+                self.abort()
+                raise
+        else:
+            self.abort()
 
 
 def download(url: str, to: str) -> None:
-    Path(to).parent.mkdir(parents=True, exist_ok=True)
+    download_many([(url, to)])
+
+
+def download_many(
+    downloads: Sequence[Tuple[str, str]],
+    *,
+    on_complete: Optional[Callable[[str], None]] = None,
+) -> None:
+    """Download and decompress every gzipped `(url, destination)` pair concurrently.
+
+    Responses are decompressed as they are received so the downloaded files
+    are never held in memory. `on_complete` is called with the destination
+    of each download as soon as it has finished.
+    """
+    if not downloads:
+        return
+
+    if is_coroutine(client.stream):
+        async_run(_download_many_async(downloads, on_complete))
+    else:
+        _download_many_sync(downloads, on_complete)
+
+
+def _download_many_sync(
+    downloads: Sequence[Tuple[str, str]],
+    on_complete: Optional[Callable[[str], None]],
+) -> None:
+    errors: List[BaseException] = []
+    with ThreadPoolExecutor(max_workers=len(downloads)) as executor:
+        futures = {
+            executor.submit(_download_sync, url, to): to for url, to in downloads
+        }
+        for future in as_completed(futures):
+            exc = future.exception()
+            if exc is not None:
+                errors.append(exc)
+            elif on_complete is not None:
+                on_complete(futures[future])
+
+    if errors:
+        raise errors[0]
+
+
+async def _download_many_async(
+    downloads: Sequence[Tuple[str, str]],
+    on_complete: Optional[Callable[[str], None]],
+) -> None:
+    async def download_one(url: str, to: str) -> None:
+        await _download_async(url, to)
+        if on_complete is not None:
+            on_complete(to)
 
-    tmp = to + '.tmp'
-    tar = to + '.gz.tmp'
-    maybe_async_run(client.download, url, tar)
+    # wait for every download to finish so that temporary files are always cleaned up
+    results = await asyncio.gather(
+        *[download_one(url, to) for url, to in downloads],
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
 
-    # decompress to a tmp file before replacing the original
-    with gzip.open(tar, 'rb') as f_in:
-        with open(tmp, 'wb') as f_out:
-            shutil.copyfileobj(f_in, f_out)
 
-    # chmod +x
-    status = os.stat(tmp)
-    os.chmod(tmp, status.st_mode | 0o111)
+def _download_sync(url: str, to: str) -> None:
+    resp: Any = client.stream('GET', url, timeout=None)
+    try:
+        resp.original.raise_for_status()
+        with GzipFileWriter(to) as writer:
+            for chunk in resp.iter_bytes(CHUNK_SIZE):
+                writer.write(chunk)
+    finally:
+        resp.close()
 
-    # override the original
-    shutil.copy(tmp, to)
 
-    # remove temporary files
-    os.remove(tar)
-    os.remove(tmp)
+async def _download_async(url: str, to: str) -> None:
+    resp: Any = await client.stream('GET', url, timeout=None)
+    try:
+        resp.original.raise_for_status()
+        with GzipFileWriter(to) as writer:
+            async for chunk in resp.iter_bytes(CHUNK_SIZE):
+                writer.write(chunk)
+    finally:
+        resp.close()
@@ -23,6 +23,7 @@ def playground(schema: Optional[str], skip_generate: bool) -> None:
         generate_client(schema=schema, reload=True)
 
     from prisma import Client
+    from prisma.engine import QueryEngine
 
     client = Client()
 
@@ -31,5 +32,8 @@ def playground(schema: Optional[str], skip_generate: bool) -> None:
 
     # TODO: this is the result of a badly designed class
     engine = client._engine  # pylint: disable=protected-access
+    assert isinstance(
+        engine, QueryEngine
+    ), 'The playground requires a single query engine'
     assert engine.process is not None, 'Engine process unavailable for some reason'
     engine.process.wait()
@@ -0,0 +1,166 @@
+import time
+from typing import Any, Callable, List, Optional
+
+import click
+
+from ..utils import error, pretty_info
+from ...utils import module_exists
+from ..._types import FuncType
+
+
+def _supervisor_options(func: FuncType) -> FuncType:
+    options: List[Callable[[FuncType], FuncType]] = [
+        click.option(
+            '--connection-limit',
+            type=click.IntRange(min=1),
+            help='The maximum size of the database connection pool.',
+        ),
+        click.option(
+            '--pool-timeout',
+            type=click.IntRange(min=0),
+            help='The number of seconds to wait for a database connection from the pool.',
+        ),
+        click.option(
+            '--health-interval',
+            type=click.FloatRange(min=0.1),
+            default=5.0,
+            show_default=True,
+            help='The number of seconds between query engine health checks.',
+        ),
+        click.option(
+            '--max-failures',
+            type=click.IntRange(min=1),
+            default=3,
+            show_default=True,
+            help='The number of consecutive failed health checks before the query engine is restarted.',
+        ),
+        click.option(
+            '--tcp',
+            is_flag=True,
+            default=False,
+            help='Listen on a TCP port instead of a Unix domain socket.',
+        ),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+@click.group()
+def cli() -> None:
+    """Manage a query engine daemon that is shared by multiple client processes.
+
+    Clients attach to the daemon by passing `use_engine_daemon=True` or by setting
+    the PRISMA_QUERY_ENGINE_URL environment variable to the URL of the daemon.
+    """
+
+
+@cli.command()
+@_supervisor_options
+@click.option(
+    '--timeout',
+    type=click.FloatRange(min=0),
+    default=30.0,
+    show_default=True,
+    help='The number of seconds to wait for the daemon to start.',
+)
+def start(timeout: float, **kwargs: Any) -> None:
+    """Start the query engine daemon in the background"""
+    from ...engine import daemon, errors
+
+    dml = _get_schema()
+    try:
+        state = daemon.start(dml, _to_args(**kwargs), timeout=timeout)
+    except errors.EngineError as exc:
+        error(str(exc))
+
+    click.echo(
+        f'Started the query engine daemon at {click.style(state.url, fg="green")}'
+    )
+    click.echo(f'Logs are written to {daemon.get_log_file(dml)}')
+
+
+@cli.command()
+@_supervisor_options
+def run(
+    connection_limit: Optional[int],
+    pool_timeout: Optional[int],
+    health_interval: float,
+    max_failures: int,
+    tcp: bool,
+) -> None:
+    """Run the query engine daemon in the foreground"""
+    from ...engine import daemon, errors
+
+    try:
+        supervisor = daemon.Supervisor(
+            _get_schema(),
+            connection_limit=connection_limit,
+            pool_timeout=pool_timeout,
+            health_interval=health_interval,
+            max_failures=max_failures,
+            use_unix_socket=not tcp,
+        )
+        supervisor.run()
+    except errors.EngineError as exc:
+        error(str(exc))
+
+
+@cli.command()
+def stop() -> None:
+    """Stop the query engine daemon"""
+    from ...engine import daemon
+
+    state = daemon.stop(_get_schema())
+    if state is None:
+        error('The query engine daemon is not running.')
+
+    click.echo(f'Stopped the query engine daemon at {state.url}')
+
+
+@cli.command()
+def status() -> None:
+    """Show the status of the query engine daemon"""
+    from ...engine import daemon
+
+    state = daemon.read_state(_get_schema())
+    if state is None:
+        error('The query engine daemon is not running.')
+
+    healthy = daemon.check_health(state.url)
+    click.echo(
+        pretty_info(
+            {
+                'url': state.url,
+                'pid': state.pid,
+                'engine pid': state.engine_pid,
+                'healthy': healthy,
+                'uptime': f'{round(time.time() - state.started_at)}s',
+                'restarts': state.restarts,
+                'connection limit': state.connection_limit or 'default',
+            }
+        )
+    )
+    if not healthy:
+        raise SystemExit(1)
+
+
+def _get_schema() -> str:
+    if not module_exists('prisma.client'):
+        error('Prisma Client Python has not been generated yet.')
+
+    from prisma.client import SCHEMA  # pylint: disable=import-outside-toplevel
+
+    return SCHEMA
+
+
+def _to_args(**options: Any) -> List[str]:
+    args: List[str] = []
+    for name, value in options.items():
+        flag = '--' + name.replace('_', '-')
+        if isinstance(value, bool):
+            if value:
+                args.append(flag)
+        elif value is not None:
+            args.extend([flag, str(value)])
+    return args
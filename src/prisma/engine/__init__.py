@@ -2,6 +2,7 @@ from .errors import *
 
 try:
     from .query import *
+    from .pool import *
 except ModuleNotFoundError:
     # code has not been generated yet
     pass
@@ -0,0 +1,496 @@
+import os
+import re
+import sys
+import json
+import time
+import signal
+import socket
+import hashlib
+import logging
+import tempfile
+import threading
+import subprocess
+import http.client
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from . import utils, errors
+from ..binaries import GLOBAL_TEMP_DIR, platform
+
+
+__all__ = (
+    'DaemonState',
+    'Supervisor',
+    'start',
+    'stop',
+    'read_state',
+    'check_health',
+    'parse_engine_url',
+)
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# state for every running daemon is stored here, keyed by a hash of the schema
+DAEMON_DIR = GLOBAL_TEMP_DIR.parent / 'daemons'
+
+# daemons started by this process, exited children are only reaped through
+# their Popen object so that it still reports the correct exit code
+_children: Dict[int, 'subprocess.Popen[bytes]'] = {}
+
+
+class DaemonState(NamedTuple):
+    pid: int
+    engine_pid: Optional[int]
+    url: str
+    started_at: float
+    restarts: int
+    connection_limit: Optional[int]
+
+
+def schema_hash(dml: str) -> str:
+    return hashlib.sha256(dml.encode('utf-8')).hexdigest()[:16]
+
+
+def get_state_file(dml: str) -> Path:
+    return DAEMON_DIR / f'{schema_hash(dml)}.json'
+
+
+def get_log_file(dml: str) -> Path:
+    return DAEMON_DIR / f'{schema_hash(dml)}.log'
+
+
+def get_socket_path(dml: str) -> Path:
+    # the socket path is the same for every daemon process for a schema
+    # so that attached clients can reconnect after the daemon is restarted
+    return Path(tempfile.gettempdir()) / f'prisma-engine-daemon-{schema_hash(dml)}.sock'
+
+
+def read_state(dml: str) -> Optional[DaemonState]:
+    """Returns the state of the running daemon for the given schema or None if it is not running"""
+    file = get_state_file(dml)
+    try:
+        state = DaemonState(**json.loads(file.read_text()))
+    except (OSError, ValueError, TypeError):
+        return None
+
+    if not _is_running(state.pid):
+        log.debug('Removing stale daemon state for process %i', state.pid)
+        _remove(file)
+        return None
+
+    return state
+
+
+def write_state(dml: str, state: DaemonState) -> None:
+    file = get_state_file(dml)
+    file.parent.mkdir(parents=True, exist_ok=True)
+
+    # write to a temporary file first so that clients never read a partially written state
+    tmp = file.with_name(f'{file.name}.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(state._asdict()))
+    os.replace(tmp, file)
+
+
+def parse_engine_url(url: str) -> Tuple[str, Optional[str]]:
+    """Returns the HTTP URL and the path to the Unix domain socket, if any, for a query engine URL.
+
+    URLs are either HTTP URLs, e.g. `http://localhost:4466`, or paths
+    to Unix domain sockets, e.g. `unix:/tmp/query-engine.sock`.
+    """
+    if url.startswith('unix:'):
+        path = url[len('unix:') :]
+        if not path:
+            raise ValueError(f'Expected a path to a Unix domain socket in {url}')
+        return 'http://localhost', path
+
+    if not url.startswith(('http://', 'https://')):
+        raise ValueError(
+            f'Expected the query engine URL to be a http:// or unix: URL but got {url}'
+        )
+
+    return url.rstrip('/'), None
+
+
+def check_health(url: str, *, timeout: float = 1.0) -> bool:
+    """Returns whether or not the query engine at the given URL is accepting requests"""
+    http_url, socket_path = parse_engine_url(url)
+    connection: http.client.HTTPConnection
+    if socket_path is not None:
+        connection = _UnixHTTPConnection(socket_path, timeout=timeout)
+    else:
+        parts = urlsplit(http_url)
+        cls = (
+            http.client.HTTPSConnection
+            if parts.scheme == 'https'
+            else http.client.HTTPConnection
+        )
+        connection = cls(parts.netloc, timeout=timeout)
+
+    try:
+        connection.request('GET', '/status')
+        response = connection.getresponse()
+        body = response.read()
+    except (OSError, http.client.HTTPException) as exc:
+        log.debug('Query engine health check failed due to %s', exc)
+        return False
+    finally:
+        connection.close()
+
+    if response.status != 200:
+        return False
+
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return False
+
+    return isinstance(data, dict) and data.get('Errors') is None
+
+
+def apply_datasource_params(
+    dml: str, env: Dict[str, str], params: Dict[str, Any]
+) -> None:
+    """Add the given query parameters to the datasource URL environment variable in the given environment"""
+    params = {key: value for key, value in params.items() if value is not None}
+    if not params:
+        return
+
+    name = get_datasource_env(dml)
+    if name is None or name not in env:
+        raise errors.EngineError(
+            'Could not configure the connection pool as the datasource URL is not read from an environment variable'
+        )
+
+    env[name] = add_url_params(env[name], params)
+
+
+def get_datasource_env(dml: str) -> Optional[str]:
+    match = re.search(r'url\s*=\s*env\(\s*"([^"]+)"\s*\)', dml)
+    return match.group(1) if match else None
+
+
+def add_url_params(url: str, params: Dict[str, Any]) -> str:
+    # NOTE: urlunsplit() is not used as it normalises URLs such as `file:dev.db`
+    base, _, existing = url.partition('?')
+    query = [
+        (key, value)
+        for key, value in parse_qsl(existing, keep_blank_values=True)
+        if key not in params
+    ]
+    query.extend((key, str(value)) for key, value in params.items())
+    return f'{base}?{urlencode(query)}'
+
+
+class Supervisor:
+    """Runs a query engine and restarts it if it exits or stops responding to health checks"""
+
+    def __init__(
+        self,
+        dml: str,
+        *,
+        connection_limit: Optional[int] = None,
+        pool_timeout: Optional[int] = None,
+        health_interval: float = 5,
+        max_failures: int = 3,
+        use_unix_socket: bool = True,
+        timeout: float = 30,
+    ) -> None:
+        self.dml = dml
+        self.connection_limit = connection_limit
+        self.pool_timeout = pool_timeout
+        self.health_interval = health_interval
+        self.max_failures = max_failures
+        self.timeout = timeout
+        self.restarts = 0
+        self.process: Optional['subprocess.Popen[bytes]'] = None
+        self.started_at = time.time()
+        self._failures = 0
+        self._stopping = threading.Event()
+
+        self.file = utils.ensure()
+        self.socket_path: Optional[Path] = None
+        if use_unix_socket and utils.supports_unix_socket(self.file):
+            self.socket_path = get_socket_path(dml)
+            self.url = f'unix:{self.socket_path}'
+            self._address = ['--unix-path', str(self.socket_path)]
+        else:
+            port = utils.get_open_port()
+            self.url = f'http://localhost:{port}'
+            self._address = ['-p', str(port)]
+
+    def run(self) -> None:
+        if read_state(self.dml) is not None:
+            raise errors.AlreadyConnectedError(
+                'A query engine daemon is already running for this schema'
+            )
+
+        signal.signal(signal.SIGTERM, self._on_signal)
+        signal.signal(signal.SIGINT, self._on_signal)
+
+        try:
+            self._start_engine()
+
+            while not self._stopping.wait(self.health_interval):
+                self._check()
+        finally:
+            self._stop_engine()
+            _remove(get_state_file(self.dml))
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def _on_signal(self, signum: int, frame: Any) -> None:
+        log.debug('Received signal %i, stopping the query engine daemon', signum)
+        self.stop()
+
+    def _check(self) -> None:
+        process = self.process
+        if process is None or process.poll() is not None:
+            log.warning('The query engine exited, restarting it')
+            self._restart()
+            return
+
+        if check_health(self.url):
+            self._failures = 0
+            return
+
+        self._failures += 1
+        log.warning(
+            'The query engine failed %i of %i health checks',
+            self._failures,
+            self.max_failures,
+        )
+        if self._failures >= self.max_failures:
+            self._restart()
+
+    def _restart(self) -> None:
+        self._stop_engine()
+        self.restarts += 1
+        self._failures = 0
+
+        try:
+            self._start_engine()
+        except errors.EngineError as exc:
+            # the next health check will try again
+            log.warning('Could not restart the query engine due to %s', exc)
+
+    def _start_engine(self) -> None:
+        if self.socket_path is not None:
+            _remove(self.socket_path)
+
+        env = os.environ.copy()
+        env.update(
+            PRISMA_DML=self.dml,
+            RUST_LOG='error',
+            RUST_LOG_FORMAT='json',
+        )
+        apply_datasource_params(
+            self.dml,
+            env,
+            {
+                'connection_limit': self.connection_limit,
+                'pool_timeout': self.pool_timeout,
+            },
+        )
+
+        args: List[str] = [
+            str(self.file.absolute()),
+            *self._address,
+            '--enable-raw-queries',
+        ]
+        self.process = process = subprocess.Popen(
+            args, env=env, stdout=sys.stdout, stderr=sys.stderr
+        )
+
+        start = time.monotonic()
+        delay = 0.01
+        while not check_health(self.url):
+            code = process.poll()
+            if code is not None:
+                raise errors.EngineConnectionError(
+                    f'The query engine exited with code {code} before it was ready'
+                )
+
+            if time.monotonic() - start >= self.timeout or self._stopping.wait(delay):
+                self._stop_engine()
+                raise errors.EngineConnectionError(
+                    'Could not connect to the query engine'
+                )
+
+            delay = min(delay * 2, 0.5)
+
+        write_state(
+            self.dml,
+            DaemonState(
+                pid=os.getpid(),
+                engine_pid=process.pid,
+                url=self.url,
+                started_at=self.started_at,
+                restarts=self.restarts,
+                connection_limit=self.connection_limit,
+            ),
+        )
+        log.debug('Query engine daemon is serving %s', self.url)
+
+    def _stop_engine(self) -> None:
+        process = self.process
+        if process is not None:
+            if platform.name() == 'windows':
+                process.kill()
+            else:
+                process.send_signal(signal.SIGINT)
+
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+            self.process = None
+
+        if self.socket_path is not None:
+            _remove(self.socket_path)
+
+
+def start(dml: str, args: List[str], *, timeout: float = 30) -> DaemonState:
+    """Start a query engine daemon for the given schema in the background.
+
+    The daemon is run by invoking `prisma py engine run` with the given arguments.
+    """
+    state = read_state(dml)
+    if state is not None:
+        raise errors.AlreadyConnectedError(
+            f'A query engine daemon is already running for this schema at {state.url}'
+        )
+
+    log_file = get_log_file(dml)
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_file, 'ab') as output:
+        process = subprocess.Popen(  # pylint: disable=consider-using-with
+            [sys.executable, '-m', 'prisma', 'py', 'engine', 'run', *args],
+            stdin=subprocess.DEVNULL,
+            stdout=output,
+            stderr=subprocess.STDOUT,
+            # the daemon must outlive the current process
+            start_new_session=True,
+        )
+
+    _children[process.pid] = process
+    start_time = time.monotonic()
+    delay = 0.01
+    while True:
+        state = read_state(dml)
+        if state is not None and state.pid == process.pid:
+            return state
+
+        code = process.poll()
+        if code is not None:
+            raise errors.EngineConnectionError(
+                f'The query engine daemon exited with code {code}, see {log_file} for details'
+            )
+
+        if time.monotonic() - start_time >= timeout:
+            process.terminate()
+            raise errors.EngineConnectionError(
+                f'Timed out waiting for the query engine daemon to start, see {log_file} for details'
+            )
+
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+
+def stop(dml: str, *, timeout: float = 10) -> Optional[DaemonState]:
+    """Stop the query engine daemon for the given schema, returns the state of the stopped daemon"""
+    state = read_state(dml)
+    if state is None:
+        return None
+
+    os.kill(state.pid, signal.SIGTERM)
+
+    deadline = time.monotonic() + timeout
+    while _is_running(state.pid):
+        if time.monotonic() >= deadline:
+            log.warning('The query engine daemon did not stop in time, killing it')
+            for pid in (state.pid, state.engine_pid):
+                if pid is not None and _is_running(pid):
+                    os.kill(pid, getattr(signal, 'SIGKILL', signal.SIGTERM))
+
+            _remove(get_state_file(dml))
+            break
+
+        time.sleep(0.05)
+
+    return state
+
+
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    ERROR_ACCESS_DENIED = 5
+    STILL_ACTIVE = 259
+
+    def _is_pid_running(pid: int) -> bool:
+        # os.kill(pid, 0) cannot be used on Windows as signal 0 is CTRL_C_EVENT
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            # the process exists but is owned by another user
+            return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+
+        try:
+            exit_code = wintypes.DWORD()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return False
+
+            return exit_code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+
+
+else:
+
+    def _is_pid_running(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            # the process exists but is owned by another user
+            return True
+        except OSError:
+            return False
+
+        return True
+
+
+def _is_running(pid: int) -> bool:
+    process = _children.get(pid)
+    if process is not None:
+        # children that have exited still exist until they are reaped
+        return process.poll() is None
+
+    return _is_pid_running(pid)
+
+
+def _remove(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, *, timeout: float) -> None:
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(
+            socket.AF_UNIX, socket.SOCK_STREAM
+        )  # pylint: disable=no-member
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
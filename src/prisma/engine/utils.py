@@ -1,17 +1,22 @@
 import os
 import sys
+import json
 import time
+import uuid
 import socket
 import logging
+import tempfile
+import threading
 import subprocess
 from pathlib import Path
-from typing import NoReturn, Dict, Type, Any
+from functools import lru_cache
+from typing import IO, Callable, NoReturn, Optional, Dict, Type, Any
 
 from . import errors
 from .. import errors as prisma_errors
 
 from ..http import Response
-from ..utils import time_since
+from ..utils import time_since, _env_bool
 from ..binaries import GLOBAL_TEMP_DIR, ENGINE_VERSION, platform
 
 
@@ -24,6 +29,10 @@ ERROR_MAPPING: Dict[str, Type[Exception]] = {
     'P2025': prisma_errors.RecordNotFoundError,
 }
 
+# query engine versions and options that have been checked, keyed by the path
+# to the query engine and invalidated whenever the query engine file changes
+VERSION_CACHE_FILE = GLOBAL_TEMP_DIR.parent / 'version-cache.json'
+
 
 def ensure() -> Path:
     start_time = time.monotonic()
@@ -64,26 +73,117 @@ def ensure() -> Path:
             'Try running prisma py fetch'
         )
 
-    start_version = time.monotonic()
+    version = None
+    if not _env_bool('PRISMA_PY_FORCE_VERSION_CHECK'):
+        version = get_cached_version(file)
+
+    if version is None:
+        version = get_version(file)
+
+        # mismatched versions are not cached so that they are reported every time
+        if not force_version or version == ENGINE_VERSION:
+            cache_version(file, version)
+    else:
+        log.debug('Using cached query engine version')
+
+    log.debug('Using query engine version %s', version)
+
+    if force_version and version != ENGINE_VERSION:
+        raise errors.MismatchedVersionsError(expected=ENGINE_VERSION, got=version)
+
+    log.debug('Using query engine at %s', file)
+    log.debug('Ensuring query engine took: %s', time_since(start_time))
+
+    return file
+
+
+def get_version(file: Path) -> str:
+    start = time.monotonic()
     process = subprocess.run(
         [file.absolute(), '--version'], stdout=subprocess.PIPE, check=True
     )
-    log.debug('Version check took %s', time_since(start_version))
+    log.debug('Version check took %s', time_since(start))
 
-    version = (
+    return (
         str(process.stdout, sys.getdefaultencoding())
         .replace('query-engine', '')
         .strip()
     )
-    log.debug('Using query engine version %s', version)
 
-    if force_version and version != ENGINE_VERSION:
-        raise errors.MismatchedVersionsError(expected=ENGINE_VERSION, got=version)
 
-    log.debug('Using query engine at %s', file)
-    log.debug('Ensuring query engine took: %s', time_since(start_time))
+def _version_cache_key(file: Path) -> Dict[str, Any]:
+    stat = file.stat()
+    return {
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'inode': stat.st_ino,
+    }
+
+
+def _read_version_cache() -> Dict[str, Any]:
+    try:
+        data = json.loads(VERSION_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict):
+        return {}
+
+    return data
+
+
+def _get_cache_entry(file: Path) -> Dict[str, Any]:
+    """Returns the cached details of the given query engine if it has not changed since they were cached"""
+    entry = _read_version_cache().get(str(file.absolute()))
+    if not isinstance(entry, dict):
+        return {}
+
+    try:
+        if entry.get('key') != _version_cache_key(file):
+            return {}
+    except OSError:
+        return {}
+
+    return entry
+
+
+def _update_cache_entry(file: Path, **values: Any) -> None:
+    data = _read_version_cache()
+    key = _version_cache_key(file)
+
+    # details cached for a previous version of the query engine are discarded
+    entry = data.get(str(file.absolute()))
+    if not isinstance(entry, dict) or entry.get('key') != key:
+        entry = {'key': key}
+
+    entry.update(values)
+    data[str(file.absolute())] = entry
+
+    # write to a temporary file first so that other processes never read a partially written cache
+    VERSION_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = VERSION_CACHE_FILE.with_name(f'{VERSION_CACHE_FILE.name}.{os.getpid()}.tmp')
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, VERSION_CACHE_FILE)
 
-    return file
+
+def get_cached_version(file: Path) -> Optional[str]:
+    """Returns the cached version of the given query engine if it has not changed since it was cached"""
+    version = _get_cache_entry(file).get('version')
+    return version if isinstance(version, str) else None
+
+
+def cache_version(file: Path, version: str) -> None:
+    try:
+        _update_cache_entry(file, version=version)
+    except OSError as exc:
+        log.debug('Could not cache the query engine version due to %s', exc)
+
+
+def clear_version_cache() -> None:
+    try:
+        VERSION_CACHE_FILE.unlink()
+    except FileNotFoundError:
+        pass
 
 
 def get_open_port() -> int:
@@ -119,3 +219,107 @@ def handle_response_errors(resp: Response, data: Any) -> NoReturn:
     raise errors.EngineRequestError(
         resp, f'Could not process erroneous response: {data}'
     )
+
+
+@lru_cache(maxsize=None)
+def supports_unix_socket(file: Path) -> bool:
+    """Returns whether or not the given query engine can listen on a Unix domain socket"""
+    if platform.name() == 'windows':
+        return False
+
+    supported = _get_cache_entry(file).get('unix_socket')
+    if isinstance(supported, bool):
+        log.debug('Using cached query engine options')
+        return supported
+
+    try:
+        process = subprocess.run(
+            [file.absolute(), '--help'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+    except OSError as exc:
+        log.debug('Could not check query engine options due to %s', exc)
+        return False
+
+    supported = b'--unix-path' in process.stdout
+
+    try:
+        _update_cache_entry(file, unix_socket=supported)
+    except OSError as exc:
+        log.debug('Could not cache the query engine options due to %s', exc)
+
+    return supported
+
+
+def get_socket_path() -> Path:
+    # paths to Unix domain sockets are limited to ~100 characters
+    # so we cannot use a deeper directory than the temporary directory
+    name = f'prisma-query-engine-{os.getpid()}-{uuid.uuid4().hex[:8]}.sock'
+    return Path(tempfile.gettempdir()).joinpath(name)
+
+
+# the messages logged by different query engine versions once the server is listening
+READY_MESSAGES = (
+    'Started query engine http server',
+    'Started http server',
+)
+
+
+def is_ready_message(line: bytes) -> bool:
+    """Returns whether or not the given query engine log line signals that the server has started"""
+    if not line.startswith(b'{'):
+        return False
+
+    try:
+        data = json.loads(line)
+        message = data['fields']['message']
+    except (ValueError, KeyError, TypeError):
+        return False
+
+    return isinstance(message, str) and message.startswith(READY_MESSAGES)
+
+
+class EngineOutputReader(threading.Thread):
+    """Forwards the output of the query engine and detects the log line that signals it has started.
+
+    `on_ready` is called once the server has started or the output has ended, i.e. the
+    query engine has exited, whichever happens first.
+    """
+
+    def __init__(
+        self,
+        stream: IO[bytes],
+        on_ready: Callable[[], None],
+        *,
+        forward_ready_message: bool = False,
+    ) -> None:
+        super().__init__(name='prisma-query-engine-output', daemon=True)
+        self.stream = stream
+        self.ready = False
+        self._on_ready = on_ready
+        self._forward_ready_message = forward_ready_message
+
+    def run(self) -> None:
+        try:
+            for line in iter(self.stream.readline, b''):
+                if not self.ready and is_ready_message(line):
+                    self._set_ready()
+                    if not self._forward_ready_message:
+                        continue
+
+                # sys.stdout is looked up every time as it may be replaced, e.g. by pytest
+                sys.stdout.write(line.decode('utf-8', errors='replace'))
+                sys.stdout.flush()
+        except (OSError, ValueError) as exc:
+            log.debug('Stopped reading query engine output due to %s', exc)
+        finally:
+            self.stream.close()
+
+            if not self.ready:
+                self._on_ready()
+
+    def _set_ready(self) -> None:
+        self.ready = True
+        self._on_ready()
@@ -11,6 +11,7 @@ __all__ = (
     'RecordNotFoundError',
     'HTTPClientClosedError',
     'ClientNotConnectedError',
+    'QueryQueueTimeoutError',
     'PluginError',
     'PluginMissingRequiredHookError',
 )
@@ -28,6 +29,16 @@ class ClientNotConnectedError(PrismaError):
         )
 
 
+class QueryQueueTimeoutError(PrismaError):
+    timeout: float
+
+    def __init__(self, timeout: float) -> None:
+        super().__init__(
+            f'Timed out after waiting {timeout}s for a query slot to become available.'
+        )
+        self.timeout = timeout
+
+
 class HTTPClientClosedError(PrismaError):
     def __init__(self) -> None:
         super().__init__('Cannot make a request from a closed client.')
@@ -46,6 +46,13 @@ TYPE_MAPPING = {
     'Float': 'float',
     'BigInt': 'int',
 }
+# functions for converting query engine values to the type that the model expects,
+# other scalar types are returned in the correct format already
+ENGINE_CONVERTERS = {
+    'DateTime': '_parse_datetime',
+    'BigInt': 'int',
+    'Float': 'float',
+}
 FILTER_TYPES = ['String', 'DateTime', 'Boolean', 'Int', 'BigInt', 'Float']
 
 data_ctx: ContextVar['Data'] = ContextVar('data_ctx')
@@ -76,6 +83,12 @@ class HttpChoices(str, enum.Enum):
     requests = 'requests'
 
 
+class JSONBackendChoices(str, enum.Enum):
+    stdlib = 'stdlib'
+    orjson = 'orjson'
+    ujson = 'ujson'
+
+
 class Module(BaseModel):
     spec: machinery.ModuleSpec
 
@@ -194,6 +207,7 @@ class Config(BaseSettings):
     """Custom generator config options."""
 
     http: HttpChoices = HttpChoices.aiohttp
+    json_backend: JSONBackendChoices = JSONBackendChoices.stdlib
     partial_type_generator: Optional[Module]
     recursive_type_depth: int = FieldInfo(default=5)
 
@@ -234,6 +248,24 @@ class Config(BaseSettings):
 
         return value
 
+    @validator('json_backend', always=True, allow_reuse=True)
+    @classmethod
+    def json_backend_is_installed(cls, value: JSONBackendChoices) -> str:
+        try:
+            if value == 'orjson':
+                import orjson  # pyright: ignore[reportUnusedImport, reportMissingImports]
+            elif value == 'ujson':
+                import ujson  # pyright: ignore[reportUnusedImport, reportMissingImports]
+        except ModuleNotFoundError as exc:
+            # pylint: disable=line-too-long
+            raise ValueError(
+                f'Missing library for "{value}"\n  '
+                'Did you specify the correct JSON backend in your `schema.prisma` file?\n  '
+                'See https://prisma-client-py.readthedocs.io/en/latest/config/#json-libraries'
+            ) from exc
+
+        return value
+
     @validator('partial_type_generator', pre=True, always=True, allow_reuse=True)
     @classmethod
     def partial_type_generator_converter(cls, value: Optional[str]) -> Optional[Module]:
@@ -314,6 +346,19 @@ class Model(BaseModel):
             if field.type in ATOMIC_FIELD_TYPES:
                 yield field
 
+    @property
+    def cursor_field(self) -> Optional['Field']:
+        """The field that is used to paginate through records, the ID field or the first unique field"""
+        for field in self.scalar_fields:
+            if field.is_id:
+                return field
+
+        for field in self.scalar_fields:
+            if field.is_unique and field.is_required:
+                return field
+
+        return None
+
     @property
     def has_relational_fields(self) -> bool:
         try:
@@ -412,6 +457,17 @@ class Field(BaseModel):
                 f'Could not parse {self.name} due to unknown type: {self.type}',
             ) from exc
 
+    @property
+    def engine_converter(self) -> Optional[str]:
+        """The function used to convert a query engine value for this field, if required
+
+        Enum values are not converted as models are configured with `use_enum_values`.
+        """
+        if self.kind == 'object':
+            return f'{self.type}._from_engine'
+
+        return ENGINE_CONVERTERS.get(self.type)
+
     @property
     def create_input_type(self) -> str:
         if self.kind != 'object':
@@ -1,7 +1,18 @@
 from abc import abstractmethod, ABC
-from typing import Any, Union, Coroutine, Type, TypeVar, Generic, Optional, cast
-
-from ._types import Method
+from typing import (
+    Any,
+    Union,
+    Coroutine,
+    Type,
+    TypeVar,
+    Generic,
+    Optional,
+    Iterator,
+    AsyncIterator,
+    cast,
+)
+
+from ._types import Method, TypedDict
 from .utils import _NoneType
 from .errors import HTTPClientClosedError
 
@@ -12,13 +23,33 @@ ReturnType = TypeVar('ReturnType')
 MaybeCoroutine = Union[Coroutine[Any, Any, ReturnType], ReturnType]
 
 
+class HTTPConfig(TypedDict, total=False):
+    # maximum number of connections that are kept open
+    pool_size: int
+
+    # seconds that an idle connection is kept open for, only supported by aiohttp
+    keepalive_timeout: float
+
+
 class AbstractHTTP(ABC, Generic[Session, Response]):
-    def __init__(self) -> None:
+    unix_socket: Optional[str]
+    config: HTTPConfig
+
+    def __init__(
+        self,
+        *,
+        unix_socket: Optional[str] = None,
+        config: Optional[HTTPConfig] = None,
+    ) -> None:
         # NoneType = not used yet
         # None = closed
         # Session = open
         self._session = _NoneType  # type: Optional[Union[Session, Type[_NoneType]]]
 
+        # settings that are applied when the session is opened
+        self.unix_socket = unix_socket
+        self.config = config if config is not None else {}
+
     @abstractmethod
     def __del__(self) -> None:
         ...
@@ -33,8 +64,20 @@ class AbstractHTTP(ABC, Generic[Session, Response]):
     ) -> MaybeCoroutine['AbstractResponse[Response]']:
         ...
 
+    @abstractmethod
+    def stream(
+        self, method: Method, url: str, **kwargs: Any
+    ) -> MaybeCoroutine['AbstractResponse[Response]']:
+        """Send a request without reading the response body.
+
+        The body should then be consumed using `AbstractResponse.iter_bytes()`
+        and the response closed once it is no longer needed.
+        """
+        ...
+
     @abstractmethod
     def open(self) -> None:
+        """Open the session, connecting over `unix_socket` if given and applying `config`"""
         ...
 
     @abstractmethod
@@ -90,10 +133,24 @@ class AbstractResponse(ABC, Generic[Response]):
     def json(self) -> MaybeCoroutine[Any]:
         ...
 
+    @abstractmethod
+    def read(self) -> MaybeCoroutine[bytes]:
+        ...
+
     @abstractmethod
     def text(self) -> MaybeCoroutine[Any]:
         ...
 
+    @abstractmethod
+    def iter_bytes(
+        self, chunk_size: int = 65536
+    ) -> Union[Iterator[bytes], AsyncIterator[bytes]]:
+        ...
+
+    @abstractmethod
+    def close(self) -> None:
+        ...
+
     def __repr__(self) -> str:
         return str(self)
 
@@ -64,3 +64,15 @@ def test_commit(client: Client) -> None:
         assert client.user.count() == 0
 
     assert client.user.count() == 1
+
+
+def test_commit_results(client: Client) -> None:
+    """Committing returns the result of every query"""
+    batcher = client.batch_(transaction=False)
+    created = batcher.user.create({'name': 'Robert'})
+    count = batcher.user.count()
+    results = batcher.commit()
+
+    assert len(results) == 2
+    assert created.result.name == 'Robert'
+    assert count.result in {0, 1}
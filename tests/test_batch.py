@@ -1,8 +1,13 @@
 import inspect
+from typing import Any, List
 
 import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
 import prisma
 from prisma import Client
+from prisma.engine.query import QueryEngine
+from prisma._batch import BatchProgress, BatchProgressTracker, chunk_queries
 
 
 @pytest.mark.asyncio
@@ -237,6 +242,235 @@ async def test_create_many_unsupported(client: Client) -> None:
     assert exc.match(r'create_many\(\) is not supported by sqlite')
 
 
+@pytest.mark.asyncio
+async def test_commit_results(client: Client) -> None:
+    """Committing returns the parsed result of every query"""
+    batcher = client.batch_()
+    created = batcher.user.create({'name': 'Robert'})
+    batcher.user.create({'name': 'Tegan'})
+    count = batcher.user.update_many(
+        where={'name': {'startswith': 'Robert'}}, data={'name': 'Roberto'}
+    )
+    results = await batcher.commit()
+
+    assert len(results) == 3
+    assert isinstance(results[0], prisma.models.User)
+    assert results[0].name == 'Robert'
+    assert results[1].name == 'Tegan'
+    assert results[2] == 1
+
+    assert created.result.name == 'Robert'
+    assert count.result == 1
+
+
+@pytest.mark.asyncio
+async def test_result_before_commit(client: Client) -> None:
+    """Accessing a result before committing raises an error"""
+    batcher = client.batch_()
+    result = batcher.user.create({'name': 'Robert'})
+    assert not result.done
+
+    with pytest.raises(prisma.errors.PrismaError) as exc:
+        _ = result.result
+
+    assert exc.match('batch has been committed')
+
+
+@pytest.mark.asyncio
+async def test_non_transactional(client: Client) -> None:
+    """Queries in a non-transactional batch are independent of each other"""
+    await client.user.create({'id': 'abc', 'name': 'Robert'})
+
+    batcher = client.batch_(transaction=False)
+    found = batcher.user.find_unique(where={'id': 'abc'})
+    duplicate = batcher.user.create({'id': 'abc', 'name': 'Robert 2'})
+    created = batcher.user.create({'name': 'Tegan'})
+    deleted = batcher.user.delete(where={'id': 'unknown'})
+    count = batcher.user.count()
+    results = await batcher.commit()
+
+    assert isinstance(results[1], prisma.errors.UniqueViolationError)
+    assert found.result is not None
+    assert found.result.name == 'Robert'
+    assert created.result.name == 'Tegan'
+    assert deleted.result is None
+
+    with pytest.raises(prisma.errors.UniqueViolationError):
+        _ = duplicate.result
+
+    assert count.result in {1, 2}
+    assert await client.user.count() == 2
+
+
+@pytest.mark.asyncio
+async def test_transaction_error_results(client: Client) -> None:
+    """Every result in a failed transaction raises the error"""
+    batcher = client.batch_()
+    first = batcher.user.create({'id': 'abc', 'name': 'Robert'})
+    batcher.user.create({'id': 'abc', 'name': 'Robert 2'})
+
+    with pytest.raises(prisma.errors.UniqueViolationError):
+        await batcher.commit()
+
+    with pytest.raises(prisma.errors.UniqueViolationError):
+        _ = first.result
+
+
+@pytest.mark.asyncio
+async def test_chunked_commit(client: Client) -> None:
+    """Queries are sent in chunks and the results are returned in order"""
+    progress: List[BatchProgress] = []
+    batcher = client.batch_(
+        transaction=False, max_size=3, concurrency=2, on_progress=progress.append
+    )
+    for i in range(10):
+        batcher.user.create({'name': f'User {i}'})
+
+    results = await batcher.commit()
+    assert [user.name for user in results] == [f'User {i}' for i in range(10)]
+    assert await client.user.count() == 10
+
+    assert len(progress) == 4
+    assert sorted(p.size for p in progress) == [1, 3, 3, 3]
+    assert progress[-1].completed == progress[-1].total == 10
+    assert batcher.progress == progress
+
+
+@pytest.mark.asyncio
+async def test_chunked_transaction_error(client: Client) -> None:
+    """Chunks before a failed chunk in a transaction are committed and chunks after it are not sent"""
+    batcher = client.batch_(max_size=2, allow_partial_commit=True)
+    first = batcher.user.create({'id': 'abc', 'name': 'Robert'})
+    batcher.user.create({'name': 'Tegan'})
+    batcher.user.create({'id': 'abc', 'name': 'Robert 2'})
+    batcher.user.create({'name': 'Tegan 2'})
+    last = batcher.user.create({'name': 'Tegan 3'})
+
+    with pytest.raises(prisma.errors.UniqueViolationError):
+        await batcher.commit()
+
+    assert first.result.name == 'Robert'
+    assert [p.chunk for p in batcher.progress] == [0]
+
+    with pytest.raises(prisma.errors.UniqueViolationError):
+        _ = last.result
+
+    assert await client.user.count() == 2
+
+
+@pytest.mark.asyncio
+async def test_non_transactional_request_error(
+    client: Client, monkeypatch: MonkeyPatch
+) -> None:
+    """Errors sending a chunk of a non-transactional batch are raised"""
+    request_batch = QueryEngine.request_batch
+    calls = 0
+
+    async def fail_second_chunk(
+        self: QueryEngine, queries: List[str], *, transaction: bool
+    ) -> List[Any]:
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise RuntimeError('The query engine crashed')
+        return await request_batch(self, queries, transaction=transaction)
+
+    monkeypatch.setattr(QueryEngine, 'request_batch', fail_second_chunk)
+
+    batcher = client.batch_(transaction=False, max_size=2, concurrency=1)
+    first = batcher.user.create({'name': 'Robert'})
+    batcher.user.create({'name': 'Tegan'})
+    third = batcher.user.create({'name': 'Tegan 2'})
+    last = batcher.user.create({'name': 'Tegan 3'})
+
+    with pytest.raises(RuntimeError) as exc:
+        await batcher.commit()
+
+    assert exc.match('The query engine crashed')
+    assert first.result.name == 'Robert'
+
+    for result in (third, last):
+        with pytest.raises(RuntimeError):
+            _ = result.result
+
+
+def test_invalid_chunking_options(client: Client) -> None:
+    """Chunking options must be positive integers"""
+    with pytest.raises(ValueError) as exc:
+        client.batch_(max_size=0)
+
+    assert exc.match('maximum batch size must be a positive integer')
+
+    with pytest.raises(ValueError) as exc:
+        client.batch_(max_bytes=0)
+
+    assert exc.match('maximum batch bytes must be a positive integer')
+
+    with pytest.raises(ValueError) as exc:
+        client.batch_(concurrency=0)
+
+    assert exc.match('concurrency must be a positive integer')
+
+
+def test_chunked_transaction_requires_partial_commit(client: Client) -> None:
+    """Chunking a transactional batch must be explicitly allowed"""
+    with pytest.raises(ValueError) as exc:
+        client.batch_(max_size=2)
+
+    assert exc.match('pass allow_partial_commit=True')
+
+    with pytest.raises(ValueError) as exc:
+        client.batch_(max_bytes=1024)
+
+    assert exc.match('pass allow_partial_commit=True')
+
+    batcher = client.batch_(max_size=2, allow_partial_commit=True)
+    assert batcher.allow_partial_commit
+
+
+def test_chunk_queries_max_size() -> None:
+    """Queries are split into chunks of at most max_size queries"""
+    queries = ['query'] * 7
+    assert chunk_queries(queries) == [(0, 7)]
+    assert chunk_queries(queries, max_size=7) == [(0, 7)]
+    assert chunk_queries(queries, max_size=3) == [(0, 3), (3, 6), (6, 7)]
+    assert chunk_queries([], max_size=3) == []
+
+
+def test_chunk_queries_max_bytes() -> None:
+    """Queries are split into chunks of at most max_bytes"""
+    queries = ['a' * size for size in (4, 4, 10, 2, 2, 2)]
+    assert chunk_queries(queries, max_bytes=8, measure=len) == [
+        (0, 2),
+        (2, 3),
+        (3, 6),
+    ]
+    assert chunk_queries(queries, max_bytes=8, max_size=2, measure=len) == [
+        (0, 2),
+        (2, 3),
+        (3, 5),
+        (5, 6),
+    ]
+
+    with pytest.raises(TypeError):
+        chunk_queries(queries, max_bytes=8)
+
+
+def test_progress_tracker() -> None:
+    """Progress is recorded and reported for every chunk"""
+    reported: List[BatchProgress] = []
+    tracker = BatchProgressTracker(chunks=2, total=5, callback=reported.append)
+    tracker.record(1, 2, 0.5)
+    tracker.record(0, 3, 1.0)
+
+    assert reported == tracker.history
+    assert [(p.chunk, p.size, p.completed, p.duration) for p in reported] == [
+        (1, 2, 2, 0.5),
+        (0, 3, 5, 1.0),
+    ]
+    assert all(p.total == 5 and p.chunks == 2 for p in reported)
+
+
 def test_ensure_batch_and_action_signatures_are_equal(client: Client) -> None:
     """Batch method signature is the same as it's corresponding client method
 
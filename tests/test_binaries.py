@@ -1,9 +1,15 @@
+import os
+import gzip
+import subprocess
 from pathlib import Path
+from typing import List, Tuple
 
 import pytest
 from _pytest.logging import LogCaptureFixture
+from _pytest.monkeypatch import MonkeyPatch
 
-from prisma.binaries import BINARIES, ENGINES, Engine
+from prisma.binaries import BINARIES, ENGINES, Engine, platform
+from prisma.binaries.utils import GzipFileWriter
 from prisma.utils import temp_env_update
 
 
@@ -21,3 +27,134 @@ def test_engine_resolves_env_override(engine: Engine) -> None:
     # TODO: should be able to override binary resolving as well
     with temp_env_update({engine.env: 'foo'}):
         assert engine.path == Path('foo')
+
+
+@pytest.mark.parametrize(
+    'string,expected',
+    [
+        (
+            'PRETTY_NAME="Debian GNU/Linux 12 (bookworm)"\nVERSION_ID="12"\nID=debian\n',
+            ('debian', ''),
+        ),
+        (
+            'NAME="CentOS Linux"\nVERSION_ID="8"\nID="centos"\nID_LIKE="rhel fedora"\n',
+            ('centos', 'rhel fedora'),
+        ),
+        ('NAME="Alpine Linux"\nID=alpine\nVERSION_ID=3.14.2\n', ('alpine', '')),
+        ('', ('', '')),
+    ],
+)
+def test_parse_os_release(string: str, expected: Tuple[str, str]) -> None:
+    """The distribution is parsed from the os-release file"""
+    assert platform.parse_os_release(string) == expected
+
+
+@pytest.mark.parametrize(
+    'string,expected',
+    [
+        ('OpenSSL 1.1.1f  31 Mar 2020', '1.1.x'),
+        ('OpenSSL 3.0.2 15 Mar 2022', '3.0.x'),
+        ('LibreSSL 2.8.3', '1.1.x'),
+    ],
+)
+def test_parse_openssl_version(string: str, expected: str) -> None:
+    """OpenSSL versions are parsed from the version string"""
+    assert platform.parse_openssl_version(string) == expected
+
+
+def test_platform_detection_is_persisted(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    """The detected platform is persisted so that openssl is only spawned once"""
+    if platform.name() != 'linux':  # pragma: no cover
+        pytest.skip('Platform detection is only required on linux')
+
+    calls: List[List[str]] = []
+
+    def mock_run(
+        args: List[str], **kwargs: object
+    ) -> 'subprocess.CompletedProcess[bytes]':
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 0, stdout=b'OpenSSL 3.0.2 15 Mar 2022')
+
+    monkeypatch.setattr(subprocess, 'run', mock_run)
+    monkeypatch.setattr(platform, 'linux_distro', lambda: 'debian')
+    monkeypatch.setattr(platform, 'CACHE_FILE', tmp_path / 'platform.json')
+    platform.binary_platform.cache_clear()
+
+    try:
+        assert platform.binary_platform() == 'debian-openssl-3.0.x'
+        assert (tmp_path / 'platform.json').exists()
+        assert len(calls) == 1
+
+        platform.binary_platform.cache_clear()
+        assert platform.binary_platform() == 'debian-openssl-3.0.x'
+        assert len(calls) == 1
+
+        # a different OpenSSL library invalidates the persisted platform
+        monkeypatch.setattr(
+            platform, '_get_ssl_module_version', lambda: 'OpenSSL 9.9.9'
+        )
+        platform.binary_platform.cache_clear()
+        assert platform.binary_platform() == 'debian-openssl-3.0.x'
+        assert len(calls) == 2
+    finally:
+        platform.binary_platform.cache_clear()
+
+
+def test_openssl_fallback(monkeypatch: MonkeyPatch) -> None:
+    """The version linked by the ssl module is used if openssl cannot be run"""
+
+    def mock_run(*args: object, **kwargs: object) -> None:
+        raise FileNotFoundError('openssl')
+
+    monkeypatch.setattr(subprocess, 'run', mock_run)
+    monkeypatch.setattr(
+        platform, '_get_ssl_module_version', lambda: 'OpenSSL 3.0.2 15 Mar 2022'
+    )
+    assert platform.get_openssl() == '3.0.x'
+
+
+def test_gzip_file_writer(tmp_path: Path) -> None:
+    """Chunks are decompressed into an executable file that atomically replaces the destination"""
+    data = os.urandom(200000)
+    compressed = gzip.compress(data)
+    dest = tmp_path / 'binary'
+    dest.write_bytes(b'old')
+
+    with GzipFileWriter(str(dest)) as writer:
+        for i in range(0, len(compressed), 1000):
+            writer.write(compressed[i : i + 1000])
+
+        assert dest.read_bytes() == b'old'
+
+    assert dest.read_bytes() == data
+    assert os.access(dest, os.X_OK)
+    assert list(tmp_path.iterdir()) == [dest]
+
+
+def test_gzip_file_writer_truncated(tmp_path: Path) -> None:
+    """A truncated download does not replace the destination"""
+    compressed = gzip.compress(os.urandom(200000))
+    dest = tmp_path / 'binary'
+    dest.write_bytes(b'old')
+
+    with pytest.raises(EOFError):
+        with GzipFileWriter(str(dest)) as writer:
+            writer.write(compressed[: len(compressed) // 2])
+
+    assert dest.read_bytes() == b'old'
+    assert list(tmp_path.iterdir()) == [dest]
+
+
+def test_gzip_file_writer_error(tmp_path: Path) -> None:
+    """An error while downloading removes the temporary file"""
+    dest = tmp_path / 'binary'
+
+    with pytest.raises(RuntimeError):
+        with GzipFileWriter(str(dest)) as writer:
+            writer.write(gzip.compress(b'foo')[:5])
+            raise RuntimeError('Connection lost')
+
+    assert not dest.exists()
+    assert list(tmp_path.iterdir()) == []
@@ -1,12 +1,13 @@
 # fmt: off
 # I prefer this way of formatting
 import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Iterator
 
 import pytest
+from _pytest.logging import LogCaptureFixture
 from syrupy import SnapshotAssertion
 from prisma.utils import _NoneType
-from prisma.builder import QueryBuilder, serializer
+from prisma.builder import QueryBuilder, serializer, query_cache
 from prisma.errors import UnknownRelationalFieldError, UnknownModelError
 
 from .utils import assert_query_equals
@@ -32,7 +33,7 @@ def build_query(
         operation=operation,
         arguments=arguments,
         **kwargs,
-    ).build_query()
+    ).build_query(pretty=True)
 
 
 def test_basic_building() -> None:
@@ -175,7 +176,7 @@ def test_datetime_serialization_tz_aware(snapshot: SnapshotAssertion) -> None:
                 'created_at': datetime.datetime(1985, 10, 26, 1, 1, 1, tzinfo=datetime.timezone.max)
             }
         }
-    ).build_query()
+    ).build_query(pretty=True)
     assert query == snapshot
 
 
@@ -190,7 +191,7 @@ def test_datetime_serialization_tz_unaware(snapshot: SnapshotAssertion) -> None:
                 'created_at': datetime.datetime(1985, 10, 26, 1, 1, 1)
             }
         }
-    ).build_query()
+    ).build_query(pretty=True)
     assert query == snapshot
 
 
@@ -205,7 +206,7 @@ def test_unicode(snapshot: SnapshotAssertion) -> None:
                 'name': '❤',
             }
         }
-    ).build_query()
+    ).build_query(pretty=True)
     assert query == snapshot
 
 
@@ -269,5 +270,241 @@ def test_custom_serialization(snapshot: SnapshotAssertion) -> None:
                 'title': Foo(1),
             }
         }
-    ).build_query()
+    ).build_query(pretty=True)
     assert query == snapshot
+
+
+@pytest.fixture(name='cache')
+def cache_fixture() -> Iterator[None]:
+    maxsize = query_cache.maxsize
+    query_cache.cache_clear()
+    yield
+    query_cache.resize(maxsize)
+    query_cache.cache_clear()
+
+
+@pytest.mark.usefixtures('cache')
+def test_query_cache_hit() -> None:
+    """Queries with the same shape but different values share a template"""
+    first = build_query(
+        operation='query',
+        method='findUnique',
+        model='User',
+        arguments={'where': {'id': '1'}},
+    )
+    second = build_query(
+        operation='query',
+        method='findUnique',
+        model='User',
+        arguments={'where': {'id': '2'}},
+    )
+    assert second == first.replace('"1"', '"2"')
+
+    info = query_cache.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.currsize == 1
+
+
+@pytest.mark.usefixtures('cache')
+def test_query_cache_shape() -> None:
+    """Queries with different argument or include structures are cached separately"""
+    arguments: List[Dict[str, Any]] = [
+        {'where': {'id': '1'}},
+        {'where': {'name': '1'}},
+        {'where': {'id': '1'}, 'include': {'posts': True}},
+        {'where': {'id': '1'}, 'include': {'posts': {'take': 1}}},
+        {'where': {'id': '1'}, 'include': {'posts': {'take': 1, 'skip': 1}}},
+        {'where': {'id': {'IN': ['1', '2']}}},
+        {'where': {'OR': [{'id': '1'}, {'id': '2'}]}},
+        {'where': {'OR': [{'id': '1'}, {'id': '2'}, {'id': '3'}]}},
+    ]
+    queries = [
+        build_query(
+            operation='query',
+            method='findUnique',
+            model='User',
+            arguments=args,
+        )
+        for args in arguments
+    ]
+    assert len(set(queries)) == len(arguments)
+
+    info = query_cache.cache_info()
+    assert info.hits == 0
+    assert info.misses == len(arguments)
+    assert info.currsize == len(arguments)
+
+
+@pytest.mark.usefixtures('cache')
+def test_query_cache_scalar_lists() -> None:
+    """Lists of scalars with different lengths share the same template"""
+    queries = [
+        build_query(
+            operation='query',
+            method='findMany',
+            model='User',
+            arguments={'where': {'id': {'IN': ids}}},
+        )
+        for ids in (['1'], ['1', '2'], ['1', '2', '3'], [])
+    ]
+    assert 'in: ["1","2"]' in queries[1]
+    assert queries[0] == queries[1].replace('["1","2"]', '["1"]')
+    assert queries[3] == queries[1].replace('["1","2"]', '[]')
+
+    info = query_cache.cache_info()
+    assert info.hits == 3
+    assert info.misses == 1
+
+
+@pytest.mark.usefixtures('cache')
+def test_query_cache_values_with_placeholder_like_content() -> None:
+    """Values that contain the placeholder separator are escaped"""
+    query = build_query(
+        operation='query',
+        method='findUnique',
+        model='User',
+        arguments={'where': {'name': '\x000\x00'}},
+    )
+    assert 'name: "\\u00000\\u0000"' in query
+
+
+@pytest.mark.usefixtures('cache')
+def test_query_cache_eviction() -> None:
+    """The least recently used template is evicted when the cache is full"""
+    query_cache.resize(1)
+
+    for field in ['id', 'name', 'id']:
+        build_query(
+            operation='query',
+            method='findUnique',
+            model='User',
+            arguments={'where': {field: '1'}},
+        )
+
+    info = query_cache.cache_info()
+    assert info.hits == 0
+    assert info.misses == 3
+    assert info.evictions == 2
+    assert info.currsize == 1
+
+
+@pytest.mark.usefixtures('cache')
+def test_query_cache_debug_logging(caplog: LogCaptureFixture) -> None:
+    """Pretty queries that are only logged for debugging are not cached"""
+    caplog.set_level('DEBUG', logger='prisma.builder')
+
+    for _ in range(2):
+        build_query(
+            operation='query',
+            method='findUnique',
+            model='User',
+            arguments={'where': {'id': '1'}},
+        )
+
+    assert 'Generated query: \nquery {\n' in caplog.text
+
+    info = query_cache.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.currsize == 1
+
+
+@pytest.mark.usefixtures('cache')
+def test_query_cache_disabled() -> None:
+    """Setting the maximum size to 0 disables caching"""
+    query_cache.resize(0)
+
+    for _ in range(2):
+        build_query(
+            operation='query',
+            method='findUnique',
+            model='User',
+            arguments={'where': {'id': '1'}},
+        )
+
+    info = query_cache.cache_info()
+    assert info.hits == 0
+    assert info.misses == 2
+    assert info.currsize == 0
+
+    with pytest.raises(ValueError) as exc:
+        query_cache.resize(-1)
+
+    assert exc.match('Query cache size must be a positive integer or 0.')
+
+
+def test_compact_query() -> None:
+    """Queries are rendered without insignificant whitespace by default"""
+    query = QueryBuilder(
+        operation='query',
+        method='findUnique',
+        model='User',
+        arguments={
+            'where': {
+                'id': '1',
+                'name': {'IN': ['a', 'b']},
+            },
+            'include': {
+                'posts': {
+                    'take': 1,
+                    'where': {'title': {'contains': 'Test'}},
+                    'include': {'categories': True},
+                },
+                'profile': True,
+            },
+        },
+    ).build_query()
+    assert query == (
+        'query{result:findUniqueUser(where:{id:"1",name:{in:["a","b"]}})'
+        '{id name posts(take:1,where:{title:{contains:"Test"}})'
+        '{id created_at updated_at title published views desc author_id '
+        'categories{id name}} profile{id user_id bio}}}'
+    )
+
+
+def test_compact_create_many() -> None:
+    """Lists of input objects are rendered compactly"""
+    query = QueryBuilder(
+        operation='mutation',
+        method='createMany',
+        model='User',
+        arguments={
+            'data': [{'name': 'Robert'}, {'name': 'Tegan'}],
+            'skipDuplicates': None,
+        },
+        root_selection=['count'],
+    ).build_query()
+    assert query == (
+        'mutation{result:createManyUser(data:[{name:"Robert"},{name:"Tegan"}]){count}}'
+    )
+
+
+def test_pretty_lists() -> None:
+    """Lists are rendered one item per line in pretty mode"""
+    assert_query_equals(QueryBuilder(
+        operation='mutation',
+        method='createMany',
+        model='User',
+        arguments={
+            'data': [{'name': 'Robert'}, {'name': 'Tegan'}],
+        },
+        root_selection=['count'],
+    ), '''
+    mutation {
+      result: createManyUser
+      (
+        data: [
+          {
+            name: "Robert"
+          },
+          {
+            name: "Tegan"
+          }
+        ]
+      )
+      {
+        count
+      }
+    }
+    ''')
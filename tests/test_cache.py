@@ -0,0 +1,169 @@
+import time
+
+import pytest
+from prisma import Client
+from prisma._cache import QueryCache, CacheConfig
+
+
+RELATIONS = {
+    'User': ['Post', 'Profile'],
+    'Post': ['User', 'Category'],
+    'Profile': ['User'],
+    'Category': ['Post'],
+    'Types': [],
+}
+
+
+def create_cache(**config: object) -> QueryCache:
+    return QueryCache(config, relations=RELATIONS)  # type: ignore[arg-type]
+
+
+def test_cache_hit() -> None:
+    """Cached results are returned until they are invalidated"""
+    cache = create_cache()
+    assert cache.get('query') is None
+
+    cache.set('query', 'User', '{"data": {}}', cache.token('User'))
+    assert cache.get('query') == '{"data": {}}'
+
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.hit_rate == 0.5
+    assert stats.entries == 1
+    assert stats.size == len('query') + len('{"data": {}}')
+
+
+def test_cache_ttl() -> None:
+    """Results expire after the TTL for their model"""
+    cache = create_cache(ttl=0.01, model_ttls={'Types': 60, 'Profile': 0})
+    cache.set('user', 'User', 'user', cache.token('User'))
+    cache.set('types', 'Types', 'types', cache.token('Types'))
+
+    time.sleep(0.02)
+    assert cache.get('user') is None
+    assert cache.get('types') == 'types'
+    assert cache.stats().expirations == 1
+
+    assert cache.is_cacheable('User')
+    assert not cache.is_cacheable('Profile')
+
+
+def test_cache_lru_eviction() -> None:
+    """The least recently used results are evicted once the cache is full"""
+    cache = create_cache(max_entries=2)
+    cache.set('first', 'User', 'first', cache.token('User'))
+    cache.set('second', 'User', 'second', cache.token('User'))
+    assert cache.get('first') == 'first'
+
+    cache.set('third', 'User', 'third', cache.token('User'))
+    assert cache.get('second') is None
+    assert cache.get('first') == 'first'
+    assert cache.get('third') == 'third'
+    assert cache.stats().evictions == 1
+
+
+def test_cache_max_size() -> None:
+    """Results are evicted once the cache is larger than the maximum size"""
+    cache = create_cache(max_size=20)
+    cache.set('a', 'User', 'a' * 9, cache.token('User'))
+    cache.set('b', 'User', 'b' * 9, cache.token('User'))
+    cache.set('c', 'User', 'c' * 9, cache.token('User'))
+    assert cache.get('a') is None
+    assert cache.stats().size == 20
+
+    # results that are larger than the cache are never stored
+    cache.set('d', 'User', 'd' * 20, cache.token('User'))
+    assert cache.get('d') is None
+    assert cache.stats().entries == 2
+
+
+def test_cache_invalidate_related() -> None:
+    """Writing to a model invalidates the results for every model related to it"""
+    cache = create_cache()
+    for model in RELATIONS:
+        cache.set(model, model, model, cache.token(model))
+
+    cache.invalidate(['Profile'])
+    assert [model for model in RELATIONS if cache.get(model) is not None] == ['Types']
+    assert cache.stats().invalidations == 4
+
+
+def test_cache_invalidated_while_querying() -> None:
+    """Results are not cached if their model was invalidated while they were being queried"""
+    cache = create_cache()
+    token = cache.token('User')
+    cache.invalidate(['Post'])
+    cache.set('user', 'User', 'user', token)
+    assert cache.get('user') is None
+
+    token = cache.token('User')
+    cache.clear()
+    cache.set('user', 'User', 'user', token)
+    assert cache.get('user') is None
+
+    cache.set('user', 'User', 'user', cache.token('User'))
+    assert cache.get('user') == 'user'
+
+
+@pytest.mark.parametrize(
+    'config',
+    [
+        {'ttl': -1},
+        {'model_ttls': {'User': -1}},
+        {'max_entries': 0},
+        {'max_size': 0},
+    ],
+)
+def test_cache_invalid_config(config: CacheConfig) -> None:
+    """Invalid cache options raise an error"""
+    with pytest.raises(ValueError):
+        QueryCache(config)
+
+
+@pytest.mark.asyncio
+async def test_client_cache() -> None:
+    """Read queries are cached and writes invalidate the cached results"""
+    client = Client(cache={'ttl': 60})
+    await client.connect()
+
+    user = await client.user.create({'name': 'Robert'})
+    found = await client.user.find_unique(where={'id': user.id})
+    assert found is not None
+    assert found.name == 'Robert'
+
+    cached = await client.user.find_unique(where={'id': user.id})
+    assert cached == found
+
+    stats = client.cache_stats()
+    assert stats is not None
+    assert stats.hits == 1
+
+    # writes to related models invalidate cached results
+    found = await client.user.find_unique(
+        where={'id': user.id}, include={'posts': True}
+    )
+    assert found is not None
+    assert found.posts is not None
+    assert len(found.posts) == 0
+
+    await client.post.create(
+        {'title': 'Post', 'published': False, 'author': {'connect': {'id': user.id}}}
+    )
+    found = await client.user.find_unique(
+        where={'id': user.id}, include={'posts': True}
+    )
+    assert found is not None
+    assert found.posts is not None
+    assert len(found.posts) == 1
+
+    async with client.batch_() as batcher:
+        batcher.user.update(where={'id': user.id}, data={'name': 'Tegan'})
+
+    found = await client.user.find_unique(where={'id': user.id})
+    assert found is not None
+    assert found.name == 'Tegan'
+
+    await client.post.delete_many(where={'author_id': user.id})
+    await client.user.delete(where={'id': user.id})
+    await client.disconnect()
@@ -1,5 +1,9 @@
+import asyncio
+
 import pytest
 from prisma import Client, errors
+from prisma.client import READINESS_WAITS_SIZE
+from prisma.engine import AlreadyConnectedError
 
 
 @pytest.mark.asyncio
@@ -19,3 +23,65 @@ async def test_create_many_invalid_provider(client: Client) -> None:
         await client.user.create_many([{'name': 'Robert'}])
 
     assert exc.match(r'create_many\(\) is not supported by sqlite')
+
+
+@pytest.mark.asyncio
+async def test_auto_connect() -> None:
+    """The first query connects to the query engine when auto_connect is used"""
+    client = Client(auto_connect=True)
+    assert not client.is_connected()
+
+    counts = await asyncio.gather(*[client.post.count() for _ in range(3)])
+    assert counts == [counts[0]] * 3
+    assert client.is_connected()
+    assert len(client.readiness_waits) == 3
+
+    await client.post.count()
+    assert len(client.readiness_waits) == 3
+
+    await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_readiness_waits_bounded() -> None:
+    """Only the most recent readiness waits are kept"""
+    client = Client()
+    loop = asyncio.get_event_loop()
+    for _ in range(READINESS_WAITS_SIZE + 5):
+        connecting: 'asyncio.Future[None]' = loop.create_future()
+        connecting.set_result(None)
+        client._connecting = connecting  # pylint: disable=protected-access
+
+        with pytest.raises(errors.ClientNotConnectedError):
+            await client._get_engine()  # pylint: disable=protected-access
+
+    assert len(client.readiness_waits) == READINESS_WAITS_SIZE
+
+
+@pytest.mark.asyncio
+async def test_connect_background() -> None:
+    """Queries wait for the query engine to be ready when connecting in the background"""
+    client = Client()
+    await client.connect(background=True)
+    assert client.is_connected()
+
+    with pytest.raises(AlreadyConnectedError):
+        await client.connect()
+
+    assert await client.post.count() >= 0
+    assert len(client.readiness_waits) == 1
+    assert client.readiness_waits[0] > 0
+
+    await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_while_connecting() -> None:
+    """Disconnecting while connecting in the background stops the query engine"""
+    client = Client()
+    await client.connect(background=True)
+    await client.disconnect()
+    assert not client.is_connected()
+
+    with pytest.raises(errors.ClientNotConnectedError):
+        await client.post.count()
@@ -0,0 +1,129 @@
+import asyncio
+from typing import Any, List
+
+import pytest
+from prisma import Client
+from prisma.errors import RecordNotFoundError
+from prisma._coalesce import QueryCoalescer
+
+
+class Sender:
+    def __init__(self) -> None:
+        self.batches: List[List[str]] = []
+
+    async def __call__(self, queries: List[str]) -> List[Any]:
+        self.batches.append(queries)
+        results: List[Any] = []
+        for query in queries:
+            if query == 'error':
+                results.append(
+                    RecordNotFoundError({'user_facing_error': {'message': 'Not found'}})
+                )
+            else:
+                results.append({'query': query})
+        return results
+
+
+@pytest.mark.asyncio
+async def test_coalesce_same_tick() -> None:
+    """Queries executed in the same event loop iteration are sent in a single batch"""
+    sender = Sender()
+    coalescer = QueryCoalescer(sender)
+
+    results = await asyncio.gather(*[coalescer.execute(f'query{i}') for i in range(10)])
+    assert len(sender.batches) == 1
+    assert results == [{'query': f'query{i}'} for i in range(10)]
+
+    await coalescer.execute('query')
+    assert len(sender.batches) == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesce_window() -> None:
+    """Queries executed within the window are sent in a single batch"""
+    sender = Sender()
+    coalescer = QueryCoalescer(sender, window=0.05)
+
+    async def delayed(query: str) -> Any:
+        await asyncio.sleep(0.01)
+        return await coalescer.execute(query)
+
+    await asyncio.gather(coalescer.execute('first'), delayed('second'))
+    assert sender.batches == [['first', 'second']]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_max_size() -> None:
+    """Batches are sent as soon as they reach the maximum size"""
+    sender = Sender()
+    coalescer = QueryCoalescer(sender, max_size=4)
+
+    await asyncio.gather(*[coalescer.execute(f'query{i}') for i in range(10)])
+    assert [len(batch) for batch in sender.batches] == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_query_error() -> None:
+    """Errors for a single query are only raised to the caller of that query"""
+    sender = Sender()
+    coalescer = QueryCoalescer(sender)
+
+    results = await asyncio.gather(
+        coalescer.execute('query'),
+        coalescer.execute('error'),
+        return_exceptions=True,
+    )
+    assert results[0] == {'query': 'query'}
+    assert isinstance(results[1], RecordNotFoundError)
+
+
+@pytest.mark.asyncio
+async def test_coalesce_batch_error() -> None:
+    """Errors sending the batch are raised to every caller"""
+
+    async def sender(queries: List[str]) -> List[Any]:
+        raise RuntimeError('Could not send batch')
+
+    coalescer = QueryCoalescer(sender)
+    results = await asyncio.gather(
+        coalescer.execute('query'),
+        coalescer.execute('query'),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_coalesce_invalid_options() -> None:
+    """Invalid options raise an error"""
+
+    async def sender(queries: List[str]) -> List[Any]:  # pragma: no cover
+        return []
+
+    with pytest.raises(ValueError) as exc:
+        QueryCoalescer(sender, window=-1)
+
+    assert exc.match('The coalescing window must be a positive number or 0.')
+
+    with pytest.raises(ValueError) as exc:
+        QueryCoalescer(sender, max_size=0)
+
+    assert exc.match('The maximum batch size must be a positive integer.')
+
+
+@pytest.mark.asyncio
+async def test_coalesce_find_unique() -> None:
+    """Concurrent find_unique calls are coalesced into a single request"""
+    client = Client(coalesce_queries=True)
+    await client.connect()
+
+    try:
+        users = [await client.user.create({'name': f'User {i}'}) for i in range(5)]
+        found = await asyncio.gather(
+            *[client.user.find_unique(where={'id': user.id}) for user in users],
+            client.user.find_unique(where={'id': 'unknown'}),
+        )
+        assert found[:-1] == users
+        assert found[-1] is None
+    finally:
+        await client.user.delete_many()
+        await client.disconnect()
@@ -0,0 +1,96 @@
+import os
+import datetime
+from typing import Any, Dict, List
+
+import pytest
+from prisma import Client
+from prisma._columns import ColumnBuilder
+from prisma._construct import parse_datetime
+
+
+RECORDS: List[Dict[str, Any]] = [
+    {'id': 'a', 'created_at': '2021-07-25T12:00:00.000Z', 'views': 1, 'desc': None},
+    {'id': 'b', 'created_at': '2021-07-26T12:00:00.000Z', 'views': 2, 'desc': 'Foo'},
+]
+
+
+def require(name: str) -> Any:
+    if os.environ.get('PRISMA_PY_REQUIRE_COLUMN_FORMATS'):
+        return __import__(name)
+    return pytest.importorskip(name)
+
+
+def build(fields: List[str], **kwargs: Any) -> Dict[str, Any]:
+    columns = ColumnBuilder(fields, {'created_at': parse_datetime}, **kwargs)
+    for record in RECORDS:
+        columns.append(record)
+    return columns.build()
+
+
+def test_columns() -> None:
+    """Records are transposed into columns and values are converted"""
+    assert build(['id', 'created_at', 'views', 'desc']) == {
+        'id': ['a', 'b'],
+        'created_at': [
+            datetime.datetime(2021, 7, 25, 12, tzinfo=datetime.timezone.utc),
+            datetime.datetime(2021, 7, 26, 12, tzinfo=datetime.timezone.utc),
+        ],
+        'views': [1, 2],
+        'desc': [None, 'Foo'],
+    }
+
+
+def test_columns_selection() -> None:
+    """Only the given fields are included"""
+    assert build(['views']) == {'views': [1, 2]}
+
+
+def test_columns_empty() -> None:
+    """Every column is present even if there are no records"""
+    columns = ColumnBuilder(['id', 'views'], {})
+    assert columns.build() == {'id': [], 'views': []}
+
+
+def test_columns_numpy() -> None:
+    """Columns can be returned as NumPy arrays"""
+    numpy = require('numpy')
+    columns = build(['id', 'views'], format='numpy')
+    assert isinstance(columns['views'], numpy.ndarray)
+    assert columns['views'].tolist() == [1, 2]
+
+
+def test_columns_arrow() -> None:
+    """Columns can be returned as PyArrow arrays"""
+    pyarrow = require('pyarrow')
+    columns = build(['views', 'desc'], format='arrow')
+    assert isinstance(columns['views'], pyarrow.Array)
+    assert columns['desc'].to_pylist() == [None, 'Foo']
+
+
+def test_columns_unknown_format() -> None:
+    """Unknown column formats raise an error"""
+    with pytest.raises(ValueError) as exc:
+        ColumnBuilder(['id'], {}, format='foo')  # type: ignore[arg-type]
+
+    assert exc.match('Unknown column format: foo, must be one of list, numpy, arrow')
+
+
+@pytest.mark.asyncio
+async def test_find_many_columns(client: Client) -> None:
+    """Records are returned as columns of the selected fields"""
+    async with client.batch_() as batcher:
+        batcher.post.create({'title': 'Test post 1', 'published': False, 'views': 1})
+        batcher.post.create({'title': 'Test post 2', 'published': True, 'views': 2})
+
+    columns = await client.post.find_many_columns(
+        fields=['title', 'views', 'created_at'],
+        order={'title': 'asc'},
+    )
+    assert list(columns) == ['title', 'views', 'created_at']
+    assert columns['title'] == ['Test post 1', 'Test post 2']
+    assert columns['views'] == [1, 2]
+    assert all(isinstance(value, datetime.datetime) for value in columns['created_at'])
+
+    columns = await client.post.find_many_columns(where={'published': True})
+    assert columns['title'] == ['Test post 2']
+    assert 'author' not in columns
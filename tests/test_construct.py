@@ -0,0 +1,103 @@
+import datetime
+from typing import Any, Dict
+
+import pytest
+from prisma import Client, models
+from prisma._construct import get_constructor
+
+
+POST_DATA: Dict[str, Any] = {
+    'id': 'ckq1',
+    'created_at': '2021-07-25T12:34:56.789Z',
+    'updated_at': '2021-07-25T12:34:56.789+00:00',
+    'title': 'My post',
+    'published': True,
+    'views': 10,
+    'desc': None,
+    'author_id': 'ckq2',
+    'author': {'id': 'ckq2', 'name': 'Robert', 'posts': None},
+    'categories': [{'id': 1, 'name': 'Category 1'}, {'id': 2, 'name': 'Category 2'}],
+}
+
+
+def test_construct_matches_validation() -> None:
+    """Models constructed without validation are equal to validated models"""
+    post = get_constructor(models.Post)(POST_DATA)
+    assert post == models.Post.parse_obj(POST_DATA)
+    assert post.created_at == datetime.datetime(
+        2021, 7, 25, 12, 34, 56, 789000, tzinfo=datetime.timezone.utc
+    )
+    assert isinstance(post.author, models.User)
+    assert post.categories is not None
+    assert all(isinstance(category, models.Category) for category in post.categories)
+
+
+def test_construct_missing_fields() -> None:
+    """Relational fields that were not included default to None"""
+    data = POST_DATA.copy()
+    data.pop('author')
+    data.pop('categories')
+
+    post = get_constructor(models.Post)(data)
+    assert post.author is None
+    assert post.categories is None
+    assert post == models.Post.parse_obj(data)
+
+
+def test_construct_does_not_modify_data() -> None:
+    """The data that is passed to the constructor is not modified"""
+    data = POST_DATA.copy()
+    get_constructor(models.Post)(data)
+    assert data == POST_DATA
+
+
+def test_construct_bigint_string() -> None:
+    """BigInt values returned as strings are converted to integers"""
+    types = get_constructor(models.Types)({'id': 1, 'bigint': '9223372036854775807'})
+    assert types.bigint == 9223372036854775807
+
+
+def test_from_engine_matches_validation() -> None:
+    """Models created by the generated deserializer are equal to validated models"""
+    post = models.Post._from_engine(POST_DATA)
+    expected = models.Post.parse_obj(POST_DATA)
+    assert post == expected
+    assert post.dict() == expected.dict()
+    assert post.__fields_set__ == expected.__fields_set__
+    assert isinstance(post.author, models.User)
+    assert isinstance(post.created_at, datetime.datetime)
+
+
+def test_from_engine_missing_fields() -> None:
+    """Relational fields that were not included are set to None"""
+    data = POST_DATA.copy()
+    data.pop('author')
+    data.pop('categories')
+
+    post = models.Post._from_engine(data)
+    assert post.author is None
+    assert post.categories is None
+    assert 'author' not in post.__fields_set__
+    assert post == models.Post.parse_obj(data)
+
+
+@pytest.mark.asyncio
+async def test_client_validate_results(client: Client) -> None:
+    """Results are the same regardless of whether or not validation is skipped"""
+    post = await client.post.create(
+        {
+            'title': 'My post',
+            'published': False,
+            'author': {'create': {'name': 'Robert'}},
+        },
+        include={'author': True},
+    )
+    found = await client.post.find_unique(
+        where={'id': post.id},
+        include={'author': True},
+        validate_results=False,
+    )
+    assert found == post
+
+    posts = await client.post.find_many(validate_results=False)
+    assert posts == [post.copy(update={'author': None})]
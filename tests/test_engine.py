@@ -1,5 +1,9 @@
+import io
+import os
+import sys
 import asyncio
 import contextlib
+import subprocess
 from pathlib import Path
 from typing import Iterator
 
@@ -22,6 +26,14 @@ QUERY_ENGINE = next(  # pragma: no branch
 )
 
 
+@pytest.fixture(autouse=True)
+def version_cache(tmp_path: Path, monkeypatch: MonkeyPatch) -> Path:
+    """Isolate the query engine version cache from other tests"""
+    path = tmp_path / 'version-cache.json'
+    monkeypatch.setattr(utils, 'VERSION_CACHE_FILE', path)
+    return path
+
+
 @contextlib.contextmanager
 def no_event_loop() -> Iterator[None]:
     current = asyncio.get_event_loop()
@@ -128,3 +140,266 @@ def test_ensure_env_override_does_not_exist() -> None:
     assert exc.match(
         r'PRISMA_QUERY_ENGINE_BINARY was provided, but no query engine was found at foo'
     )
+
+
+def test_ensure_caches_version(testdir: Testdir, fake_process: FakeProcess) -> None:
+    """Verified query engine versions are cached until the query engine changes"""
+    fake_engine = testdir.path / f'prisma-query-engine-{platform.binary_platform()}'
+    fake_engine.write_text('foo')
+
+    fake_process.register_subprocess(
+        [fake_engine, '--version'],  # type: ignore[list-item]
+        stdout=f'query-engine {ENGINE_VERSION}',
+        occurrences=3,
+    )
+    assert utils.ensure() == fake_engine
+    assert fake_process.call_count([fake_engine, '--version']) == 1  # type: ignore[list-item]
+
+    assert utils.get_cached_version(fake_engine) == ENGINE_VERSION
+    assert utils.ensure() == fake_engine
+    assert fake_process.call_count([fake_engine, '--version']) == 1  # type: ignore[list-item]
+
+    with temp_env_update({'PRISMA_PY_FORCE_VERSION_CHECK': '1'}):
+        assert utils.ensure() == fake_engine
+
+    assert fake_process.call_count([fake_engine, '--version']) == 2  # type: ignore[list-item]
+
+    fake_engine.write_text('foo bar')
+    assert utils.get_cached_version(fake_engine) is None
+    assert utils.ensure() == fake_engine
+    assert fake_process.call_count([fake_engine, '--version']) == 3  # type: ignore[list-item]
+
+
+def test_ensure_does_not_cache_mismatched_version(
+    testdir: Testdir, fake_process: FakeProcess
+) -> None:
+    """Mismatched query engine versions are not cached"""
+    fake_engine = testdir.path / f'prisma-query-engine-{platform.binary_platform()}'
+    fake_engine.touch()
+
+    fake_process.register_subprocess(
+        [fake_engine, '--version'],  # type: ignore[list-item]
+        stdout='query-engine a-different-hash',
+        occurrences=2,
+    )
+    for _ in range(2):
+        with pytest.raises(errors.MismatchedVersionsError):
+            utils.ensure()
+
+    assert utils.get_cached_version(fake_engine) is None
+
+
+def test_version_cache_invalid(testdir: Testdir, version_cache: Path) -> None:
+    """An invalid version cache is ignored and overwritten"""
+    fake_engine = testdir.path / 'my-query-engine'
+    fake_engine.touch()
+
+    version_cache.write_text('[invalid')
+    assert utils.get_cached_version(fake_engine) is None
+
+    utils.cache_version(fake_engine, 'foo')
+    assert utils.get_cached_version(fake_engine) == 'foo'
+
+    utils.clear_version_cache()
+    assert not version_cache.exists()
+    assert utils.get_cached_version(fake_engine) is None
+
+
+@pytest.mark.parametrize(
+    'stdout,expected',
+    [
+        (
+            'USAGE:\n    query-engine [FLAGS] [OPTIONS]\n    -u, --unix-path <unix-path>',
+            True,
+        ),
+        ('USAGE:\n    query-engine [FLAGS] [OPTIONS]\n    -p, --port <port>', False),
+    ],
+)
+def test_supports_unix_socket(
+    testdir: Testdir, fake_process: FakeProcess, stdout: str, expected: bool
+) -> None:
+    """Unix domain socket support is detected from the query engine options and cached"""
+    if platform.name() == 'windows':  # pragma: no cover
+        pytest.skip('Unix domain sockets are not supported on windows')
+
+    fake_engine = testdir.path / 'my-query-engine'
+    fake_engine.touch()
+
+    fake_process.register_subprocess(
+        [fake_engine, '--help'],  # type: ignore[list-item]
+        stdout=stdout,
+    )
+    utils.supports_unix_socket.cache_clear()
+
+    try:
+        assert utils.supports_unix_socket(fake_engine) is expected
+
+        # the result is read from the disk cache in new processes
+        utils.supports_unix_socket.cache_clear()
+        assert utils.supports_unix_socket(fake_engine) is expected
+        assert fake_process.call_count([fake_engine, '--help']) == 1  # type: ignore[list-item]
+        assert utils.get_cached_version(fake_engine) is None
+    finally:
+        utils.supports_unix_socket.cache_clear()
+
+
+def test_unix_socket_path() -> None:
+    """Unix domain sockets are placed in the temporary directory and are unique"""
+    path = utils.get_socket_path()
+    assert path.name.endswith('.sock')
+    assert path != utils.get_socket_path()
+
+
+@pytest.mark.asyncio
+async def test_engine_connects_unix_socket() -> None:
+    """Can connect to the engine using a Unix domain socket"""
+    if not utils.supports_unix_socket(utils.ensure()):  # pragma: no cover
+        pytest.skip('The query engine does not support Unix domain sockets')
+
+    db = Client(use_unix_socket=True)
+    await db.connect()
+
+    engine = await db._get_engine()  # pylint: disable=protected-access
+    assert isinstance(engine, QueryEngine)
+    assert engine.socket_path is not None
+    assert engine.socket_path.exists()
+
+    assert await db.post.count() >= 0
+    await db.disconnect()
+
+
+@pytest.mark.parametrize(
+    'line,expected',
+    [
+        (
+            b'{"level":"INFO","fields":{"message":"Started query engine http server on http://127.0.0.1:4466"}}\n',
+            True,
+        ),
+        (
+            b'{"level":"INFO","fields":{"message":"Started http server on 127.0.0.1:4466"}}\n',
+            True,
+        ),
+        (
+            b'{"level":"INFO","fields":{"message":"Fetched a connection from the pool"}}\n',
+            False,
+        ),
+        (b'{"level":"INFO"}\n', False),
+        (b'Started http server\n', False),
+        (b'{invalid json\n', False),
+    ],
+)
+def test_is_ready_message(line: bytes, expected: bool) -> None:
+    """The log line that signals that the query engine has started is detected"""
+    assert utils.is_ready_message(line) is expected
+
+
+def test_output_reader(capsys: pytest.CaptureFixture[str]) -> None:
+    """Query engine output is forwarded and readiness is signalled once"""
+    calls = []
+    stream = io.BytesIO(
+        b'first line\n'
+        b'{"fields":{"message":"Started http server on 127.0.0.1:4466"}}\n'
+        b'{"fields":{"message":"Started http server on 127.0.0.1:4466"}}\n'
+        b'last line\n'
+    )
+    reader = utils.EngineOutputReader(stream, lambda: calls.append(True))
+    reader.start()
+    reader.join()
+
+    assert reader.ready
+    assert calls == [True]
+    assert capsys.readouterr().out == (
+        'first line\n'
+        '{"fields":{"message":"Started http server on 127.0.0.1:4466"}}\n'
+        'last line\n'
+    )
+
+
+def test_output_reader_exited() -> None:
+    """Readiness is signalled when the output ends before the query engine has started"""
+    calls = []
+    reader = utils.EngineOutputReader(
+        io.BytesIO(b'error\n'), lambda: calls.append(True)
+    )
+    reader.start()
+    reader.join()
+
+    assert not reader.ready
+    assert calls == [True]
+
+
+def _wait_for_child(pid: int) -> int:
+    _, status = os.waitpid(pid, 0)
+    return os.WEXITSTATUS(status)
+
+
+def _disconnect_forked(engine: QueryEngine, socket_path: Path) -> None:
+    # separate from the test so that the process assigned there is not narrowed
+    assert engine.forked
+    engine.disconnect()
+    assert engine.process is None
+    assert engine.socket_path != socket_path
+    assert not engine.forked
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='os.fork() is not available')
+def test_engine_forked_does_not_stop_parent() -> None:
+    """Query engines inherited from a parent process are never stopped by the child"""
+    engine = QueryEngine(dml='', use_unix_socket=True)
+    process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    engine.process = process
+    socket_path = engine.socket_path
+    assert socket_path is not None
+    socket_path.touch()
+
+    try:
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            code = 1
+            try:
+                _disconnect_forked(engine, socket_path)
+                code = 0
+            finally:
+                os._exit(code)
+
+        assert _wait_for_child(pid) == 0
+        assert not engine.forked
+        assert engine.process is process
+        assert process.poll() is None
+        assert socket_path.exists()
+    finally:
+        process.kill()
+        process.wait()
+        engine.process = None
+        engine.disconnect()
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='os.fork() is not available')
+@pytest.mark.asyncio
+async def test_engine_forked_reconnects() -> None:
+    """A forked child process starts its own query engine when it is first used"""
+    db = Client()
+    await db.connect()
+    engine = db._engine
+    assert isinstance(engine, QueryEngine)
+    process = engine.process
+    assert process is not None
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        code = 1
+        try:
+            loop = asyncio.new_event_loop()
+            assert loop.run_until_complete(db.post.count()) >= 0
+            assert engine.process is not None
+            assert engine.process.pid != process.pid
+            loop.run_until_complete(db.disconnect())
+            code = 0
+        finally:
+            os._exit(code)
+
+    assert _wait_for_child(pid) == 0
+    assert engine.process is process
+    assert process.poll() is None
+    assert await db.post.count() >= 0
+    await db.disconnect()
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+from prisma import Client
+from prisma.engine import QueryEnginePool, errors
+
+
+def test_invalid_pool_size() -> None:
+    """Pool sizes less than 1 raise an error"""
+    with pytest.raises(ValueError) as exc:
+        QueryEnginePool(dml='', size=0)
+
+    assert exc.match('The engine pool size must be a positive integer.')
+
+
+def test_invalid_pool_strategy() -> None:
+    """Unknown strategies raise an error"""
+    with pytest.raises(ValueError) as exc:
+        QueryEnginePool(dml='', size=2, strategy='random')  # type: ignore[arg-type]
+
+    assert exc.match(
+        'Unknown engine pool strategy: random, must be one of round_robin, least_outstanding'
+    )
+
+
+@pytest.mark.asyncio
+async def test_pool_not_connected() -> None:
+    """Sending a request before connecting raises an error"""
+    pool = QueryEnginePool(dml='', size=2)
+
+    with pytest.raises(errors.NotConnectedError):
+        await pool.request('GET', '/status')
+
+
+@pytest.mark.asyncio
+async def test_single_engine_stats(client: Client) -> None:
+    """No statistics are recorded when a pool is not used"""
+    assert client.engine_stats() == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('strategy', ['round_robin', 'least_outstanding'])
+async def test_pool_spreads_requests(strategy: str) -> None:
+    """Requests are spread across every query engine in the pool"""
+    client = Client(engine_pool_size=2, engine_pool_strategy=strategy)  # type: ignore[arg-type]
+    await client.connect()
+
+    try:
+        await asyncio.gather(*[client.post.count() for _ in range(10)])
+
+        stats = client.engine_stats()
+        assert [s.position for s in stats] == [0, 1]
+        assert len({s.pid for s in stats}) == 2
+        assert sum(s.requests for s in stats) == 10
+        assert all(s.requests > 0 for s in stats)
+        assert all(s.healthy for s in stats)
+        assert all(s.in_flight == 0 for s in stats)
+        assert all(s.average_latency > 0 for s in stats)
+    finally:
+        await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_exited_engine() -> None:
+    """Query engines that have exited are replaced"""
+    client = Client(engine_pool_size=2)
+    await client.connect()
+
+    try:
+        pool = client._engine  # pylint: disable=protected-access
+        assert isinstance(pool, QueryEnginePool)
+
+        process = pool.members[0].engine.process
+        assert process is not None
+        process.kill()
+        process.wait()
+
+        # requests are still sent to the remaining query engine
+        for _ in range(5):
+            await client.post.count()
+
+        for _ in range(100):  # pragma: no branch
+            if pool.members[0].replacements:
+                break
+            await asyncio.sleep(0.1)
+
+        stats = client.engine_stats()
+        assert stats[0].replacements == 1
+        assert stats[0].healthy
+        assert stats[0].pid != process.pid
+    finally:
+        await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_pool_disconnect_cancels_replacements(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Pending replacements are cancelled when the pool is disconnected"""
+    pool = QueryEnginePool(dml='', size=1)
+    pool._connected = True  # pylint: disable=protected-access
+
+    async def replace(member: object) -> None:
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(pool, '_replace', replace)
+    with pool._lock:  # pylint: disable=protected-access
+        pool._mark_unhealthy(pool.members[0])  # pylint: disable=protected-access
+
+    tasks = list(pool._replacements)  # pylint: disable=protected-access
+    assert len(tasks) == 1
+
+    pool.disconnect()
+    await asyncio.wait(tasks)
+    await asyncio.sleep(0)
+    assert tasks[0].cancelled()
+    assert not pool._replacements  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_pool_replacement_error_logged(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Errors raised while replacing a query engine are logged"""
+    pool = QueryEnginePool(dml='', size=1)
+    pool._connected = True  # pylint: disable=protected-access
+
+    async def replace(member: object) -> None:
+        raise RuntimeError('Could not start')
+
+    monkeypatch.setattr(pool, '_replace', replace)
+    with pool._lock:  # pylint: disable=protected-access
+        pool._mark_unhealthy(pool.members[0])  # pylint: disable=protected-access
+
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert not pool._replacements  # pylint: disable=protected-access
+    assert 'Could not replace a query engine' in caplog.text
+    assert 'Could not start' in caplog.text
@@ -172,3 +172,73 @@ async def test_order_field_not_nullable(client: Client) -> None:
         await client.post.find_many(order={'desc': None})  # type: ignore
 
     assert exc.match(r'desc')
+
+
+@pytest.mark.asyncio
+async def test_find_many_stream(client: Client) -> None:
+    """Streaming records yields the same records as find_many"""
+    async with client.batch_() as batcher:
+        for i in range(10):
+            batcher.post.create({'title': f'Test post {i}', 'published': False})
+
+    expected = await client.post.find_many(order={'title': 'asc'})
+    assert len(expected) == 10
+
+    posts = [
+        post async for post in client.post.find_many_stream(order={'title': 'asc'})
+    ]
+    assert posts == expected
+
+    posts = [
+        post
+        async for post in client.post.find_many_stream(
+            where={'title': {'contains': 'Test post 1'}},
+        )
+    ]
+    assert len(posts) == 1
+    assert posts[0].title == 'Test post 1'
+
+    posts = [post async for post in client.post.find_many_stream(take=0)]
+    assert posts == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('prefetch', [True, False])
+async def test_find_many_iter(client: Client, prefetch: bool) -> None:
+    """Iterating over records paginates through every matching record"""
+    async with client.batch_() as batcher:
+        for i in range(10):
+            batcher.post.create({'title': f'Test post {i}', 'published': i % 2 == 0})
+
+    posts = [
+        post
+        async for post in client.post.find_many_iter(
+            page_size=3,
+            order={'title': 'desc'},
+            prefetch=prefetch,
+        )
+    ]
+    assert [post.title for post in posts] == [
+        f'Test post {i}' for i in reversed(range(10))
+    ]
+
+    posts = [
+        post
+        async for post in client.post.find_many_iter(
+            page_size=2,
+            where={'published': True},
+            prefetch=prefetch,
+        )
+    ]
+    assert len(posts) == 5
+    assert all(post.published for post in posts)
+
+
+@pytest.mark.asyncio
+async def test_find_many_iter_invalid_page_size(client: Client) -> None:
+    """Page sizes less than 1 raise an error"""
+    with pytest.raises(ValueError) as exc:
+        async for _ in client.post.find_many_iter(page_size=0):
+            pass  # pragma: no cover
+
+    assert exc.match('The page size must be a positive integer.')
@@ -1,3 +1,6 @@
+import sys
+import asyncio
+from pathlib import Path
 from typing import cast
 
 import pytest
@@ -62,3 +65,44 @@ async def test_lazy_session_open() -> None:
 def test_library_property() -> None:
     """Purely here for coverage and I didn't feel like adding a pragma: no cover comment"""
     assert HTTP().library == 'aiohttp'
+
+
+@pytest.mark.asyncio
+async def test_connector_config() -> None:
+    """Connector settings are applied when the session is opened"""
+    http = HTTP(config={'pool_size': 3, 'keepalive_timeout': 5})
+    connector = http.session.connector
+    assert isinstance(connector, aiohttp.TCPConnector)
+    assert connector.limit == 3
+    await http.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(
+    sys.platform == 'win32', reason='Unix domain sockets are not supported'
+)
+async def test_unix_socket(tmp_path: Path) -> None:
+    """Requests can be sent over a Unix domain socket"""
+
+    async def handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        await reader.readuntil(b'\r\n\r\n')
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}')
+        await writer.drain()
+        writer.close()
+
+    path = str(tmp_path / 'test.sock')
+    server = await asyncio.start_unix_server(handle, path=path)
+
+    http = HTTP(unix_socket=path)
+    assert isinstance(http.session.connector, aiohttp.UnixConnector)
+
+    try:
+        resp = await http.request('GET', 'http://localhost/status')
+        assert resp.status == 200
+        assert await resp.read() == b'{}'
+    finally:
+        await http.close()
+        server.close()
+        await server.wait_closed()
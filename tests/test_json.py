@@ -0,0 +1,182 @@
+import os
+import json
+import datetime
+from typing import TYPE_CHECKING, Any, List
+
+import pytest
+from prisma._json import JSONBackend, ResultStreamDecoder, get_backend
+from prisma.builder import serializer
+
+
+if TYPE_CHECKING:
+    from _pytest.fixtures import FixtureRequest
+
+
+@pytest.fixture(name='backend', params=['stdlib', 'orjson', 'ujson'])
+def backend_fixture(request: 'FixtureRequest') -> JSONBackend:
+    name = request.param  # type: ignore[attr-defined]
+    if name != 'stdlib' and not os.environ.get('PRISMA_PY_REQUIRE_JSON_BACKENDS'):
+        pytest.importorskip(name)
+    return get_backend(name)
+
+
+def test_round_trip(backend: JSONBackend) -> None:
+    """Encoding and decoding a payload returns the same payload"""
+    data = {
+        'query': 'query{result:findUniqueUser{id}}',
+        'variables': {'v0': [1, 2.5, None, True]},
+    }
+    encoded = backend.dumps(data, default=serializer)
+    assert isinstance(encoded, str)
+    assert backend.loads(encoded) == data
+    assert backend.loads(encoded.encode('utf-8')) == data
+
+
+def test_datetime_serialization(backend: JSONBackend) -> None:
+    """Datetimes are passed to the default function and serialized in UTC"""
+    dt = datetime.datetime(1985, 10, 26, 1, 1, 1, tzinfo=datetime.timezone.max)
+    assert backend.loads(backend.dumps({'dt': dt}, default=serializer)) == {
+        'dt': '1985-10-25T01:02:01+00:00',
+    }
+
+    dt = datetime.datetime(1985, 10, 26, 1, 1, 1)
+    assert backend.loads(backend.dumps({'dt': dt}, default=serializer)) == {
+        'dt': '1985-10-26T01:01:01+00:00',
+    }
+
+
+def test_unicode(backend: JSONBackend) -> None:
+    """Unicode strings are not escaped"""
+    assert backend.dumps({'name': '❤'}, default=serializer) in {
+        '{"name": "❤"}',
+        '{"name":"❤"}',
+    }
+
+
+def test_stdlib_encoding_unchanged() -> None:
+    """The stdlib backend encodes queries exactly as the query builder always has"""
+    data = {
+        'query': 'mutation {\n  result: createOneUser(data: {name: "❤"})\n}',
+        'variables': {},
+        'dt': datetime.datetime(1985, 10, 26, 1, 1, 1),
+    }
+    assert get_backend('stdlib').dumps(data, default=serializer) == (
+        '{"query": "mutation {\\n  result: createOneUser(data: {name: \\"❤\\"})\\n}", '
+        '"variables": {}, "dt": "1985-10-26T01:01:01+00:00"}'
+    )
+
+
+def test_unserializable_type(backend: JSONBackend) -> None:
+    """Passing an unserializable type raises an error"""
+    with pytest.raises(TypeError):
+        backend.dumps({'foo': object()}, default=serializer)
+
+
+def test_unknown_backend() -> None:
+    """Requesting an unknown backend raises an error"""
+    with pytest.raises(ValueError) as exc:
+        get_backend('foo')
+
+    assert exc.match('Unknown JSON backend: foo, must be one of stdlib, orjson, ujson')
+
+
+def feed_chunks(decoder: ResultStreamDecoder, data: bytes, size: int) -> List[Any]:
+    items: List[Any] = []
+    for i in range(0, len(data), size):
+        items.extend(decoder.feed(data[i : i + size]))
+    return items
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, 1024])
+def test_stream_decoder_chunks(size: int) -> None:
+    """Result items are decoded regardless of where chunk boundaries fall"""
+    result = [
+        {'id': 'a', 'name': 'Robert', 'tags': ['x', 'y'], 'bio': None},
+        {'id': 'b', 'name': 'Tegan, \"]}\' ü', 'nested': {'views': 10.5}},
+        {'id': 'c', 'name': '😀'},
+    ]
+    data = json.dumps({'data': {'result': result}}, ensure_ascii=False).encode('utf-8')
+
+    decoder = ResultStreamDecoder()
+    assert feed_chunks(decoder, data, size) == result
+    assert decoder.close() is None
+
+
+def test_stream_decoder_yields_complete_items() -> None:
+    """Items are returned as soon as they have been fully received"""
+    decoder = ResultStreamDecoder()
+    assert decoder.feed(b'{"data":{"result":[{"id":1},{"id"') == [{'id': 1}]
+    assert decoder.feed(b':2},{"id":3}') == [{'id': 2}, {'id': 3}]
+    assert decoder.feed(b']}}') == []
+    assert decoder.close() is None
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        b'{"data":{"result":[]}}',
+        b' { "data" : { "result" : [ ] } } ',
+    ],
+)
+def test_stream_decoder_empty(data: bytes) -> None:
+    """Empty result arrays are decoded"""
+    decoder = ResultStreamDecoder()
+    assert decoder.feed(data) == []
+    assert decoder.close() is None
+
+
+def test_stream_decoder_scalars() -> None:
+    """Scalars at the end of a chunk are not returned until they are terminated"""
+    decoder = ResultStreamDecoder()
+    assert decoder.feed(b'{"data":{"result":[1,12') == [1]
+    assert decoder.feed(b'3,true]}}') == [123, True]
+    assert decoder.close() is None
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 5, 1024])
+def test_stream_decoder_scalar_chunks(size: int) -> None:
+    """Scalars are decoded regardless of where chunk boundaries fall"""
+    result = [-2500.25, 1e10, 3, 'a, "]', True, None, -0.5e-3, False, 42]
+    data = json.dumps({'data': {'result': result}}).encode('utf-8')
+
+    decoder = ResultStreamDecoder()
+    assert feed_chunks(decoder, data, size) == result
+    assert decoder.close() is None
+
+
+def test_stream_decoder_truncated_number() -> None:
+    """Numbers that continue in the next chunk are not returned early"""
+    decoder = ResultStreamDecoder()
+    assert decoder.feed(b'{"data":{"result":[1, -2500.') == [1]
+    assert decoder.feed(b'5, 2e') == [-2500.5]
+    assert decoder.feed(b'3 ]}}') == [2000.0]
+    assert decoder.close() is None
+
+
+def test_stream_decoder_errors_response() -> None:
+    """Responses without a result array are buffered and returned on close"""
+    data = {'errors': [{'error': 'Something went wrong', 'user_facing_error': {}}]}
+    decoder = ResultStreamDecoder()
+    assert feed_chunks(decoder, json.dumps(data).encode('utf-8'), 5) == []
+    assert decoder.close() == data
+
+
+def test_stream_decoder_truncated() -> None:
+    """Responses that end before the result array is closed raise an error"""
+    decoder = ResultStreamDecoder()
+    assert decoder.feed(b'{"data":{"result":[{"id":1},{"id":') == [{'id': 1}]
+
+    with pytest.raises(ValueError) as exc:
+        decoder.close()
+
+    assert exc.match('Response ended before the result array was closed')
+
+
+def test_stream_decoder_invalid_separator() -> None:
+    """Unexpected characters between result items raise an error"""
+    decoder = ResultStreamDecoder()
+
+    with pytest.raises(ValueError) as exc:
+        decoder.feed(b'{"data":{"result":[{"id":1};')
+
+    assert exc.match("Unexpected character in the result array: ';'")
@@ -0,0 +1,362 @@
+import asyncio
+from typing import Dict, List
+
+import pytest
+from prisma import Client
+from prisma.errors import QueryQueueTimeoutError
+from prisma._limiter import (
+    ConcurrencyLimiter,
+    Priority,
+    query_priority,
+    query_queue_timeout,
+    get_query_priority,
+)
+
+
+async def hold(
+    limiter: ConcurrencyLimiter, name: str, order: List[str], delay: float = 0.01
+) -> None:
+    async with limiter.slot():
+        order.append(name)
+        await asyncio.sleep(delay)
+
+
+@pytest.mark.asyncio
+async def test_limiter_limits_in_flight() -> None:
+    """No more than the limit of requests are in flight at once"""
+    limiter = ConcurrencyLimiter(2)
+    peak = 0
+
+    async def request() -> None:
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[request() for _ in range(10)])
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+    stats = limiter.stats()
+    assert stats.requests == 10
+    assert stats.waits == 8
+    assert stats.max_queued == 8
+    assert stats.queued == 0
+    assert stats.average_wait > 0
+    assert stats.max_wait >= stats.average_wait
+
+
+@pytest.mark.asyncio
+async def test_limiter_fifo() -> None:
+    """Waiting requests are given slots in the order that they were made"""
+    limiter = ConcurrencyLimiter(1)
+    order: List[str] = []
+
+    first = asyncio.ensure_future(hold(limiter, 'first', order))
+    await asyncio.sleep(0)
+    waiting = [
+        asyncio.ensure_future(hold(limiter, f'waiting{i}', order)) for i in range(3)
+    ]
+    await asyncio.sleep(0)
+
+    # a new request must not skip ahead of the requests that are already waiting
+    await asyncio.gather(first, *waiting, hold(limiter, 'last', order))
+    assert order == ['first', 'waiting0', 'waiting1', 'waiting2', 'last']
+
+
+@pytest.mark.asyncio
+async def test_limiter_timeout() -> None:
+    """Requests that wait for longer than the timeout fail"""
+    limiter = ConcurrencyLimiter(1, timeout=0.01)
+    order: List[str] = []
+
+    first = asyncio.ensure_future(hold(limiter, 'first', order, delay=0.1))
+    await asyncio.sleep(0)
+
+    with pytest.raises(QueryQueueTimeoutError) as exc:
+        await hold(limiter, 'second', order)
+
+    assert exc.match('Timed out after waiting 0.01s for a query slot')
+    assert limiter.queued == 0
+    assert limiter.timeouts == 1
+
+    await first
+    assert order == ['first']
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_queue_timeout_override() -> None:
+    """The timeout can be overridden for the queries made within a block"""
+    limiter = ConcurrencyLimiter(1)
+    order: List[str] = []
+
+    first = asyncio.ensure_future(hold(limiter, 'first', order, delay=0.1))
+    await asyncio.sleep(0)
+
+    with query_queue_timeout(0.01):
+        with pytest.raises(QueryQueueTimeoutError) as exc:
+            await hold(limiter, 'second', order)
+
+    assert exc.match('Timed out after waiting 0.01s for a query slot')
+    assert limiter.timeouts == 1
+
+    # the override only applies within the block
+    await hold(limiter, 'third', order)
+    await first
+    assert order == ['first', 'third']
+
+    # the timeout set for the limiter can be disabled
+    limiter = ConcurrencyLimiter(1, timeout=0.01)
+    first = asyncio.ensure_future(hold(limiter, 'first', order, delay=0.05))
+    await asyncio.sleep(0)
+
+    with query_queue_timeout(None):
+        await hold(limiter, 'fourth', order)
+
+    await first
+    assert limiter.timeouts == 0
+
+    with pytest.raises(ValueError):
+        with query_queue_timeout(-1):
+            pass  # pragma: no cover
+
+
+@pytest.mark.asyncio
+async def test_limiter_cancelled() -> None:
+    """Cancelled requests do not hold on to a slot"""
+    limiter = ConcurrencyLimiter(1)
+    order: List[str] = []
+
+    first = asyncio.ensure_future(hold(limiter, 'first', order))
+    await asyncio.sleep(0)
+    cancelled = asyncio.ensure_future(hold(limiter, 'cancelled', order))
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+
+    cancelled.cancel()
+    await asyncio.gather(first, hold(limiter, 'second', order))
+    assert cancelled.cancelled()
+    assert order == ['first', 'second']
+    assert limiter.in_flight == 0
+    assert limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_cancelled_after_handoff() -> None:
+    """A slot that is handed to a request that has been cancelled is released"""
+    limiter = ConcurrencyLimiter(1)
+    await limiter.acquire('normal')
+
+    waiter = asyncio.ensure_future(limiter.acquire('normal'))
+    await asyncio.sleep(0)
+
+    # the slot is handed over before the waiting request is resumed
+    limiter.release('normal')
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_cancelled_after_timeout() -> None:
+    """A request that times out and is then cancelled does not release a slot it never held"""
+    limiter = ConcurrencyLimiter(1)
+    await limiter.acquire('normal')
+
+    waiter = asyncio.ensure_future(limiter.acquire('normal', timeout=60))
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+
+    # the request times out and is cancelled before it is resumed
+    cls = limiter._classes['normal']
+    limiter._expire(cls, cls.waiters[0], 60)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter.in_flight == 1
+    assert limiter.stats().priorities['normal'].in_flight == 1
+    assert limiter.queued == 0
+
+    limiter.release('normal')
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_unlimited() -> None:
+    """Requests never wait when there is no limit"""
+    limiter = ConcurrencyLimiter()
+    order: List[str] = []
+    await asyncio.gather(*[hold(limiter, str(i), order) for i in range(100)])
+
+    stats = limiter.stats()
+    assert stats.limit is None
+    assert stats.requests == 100
+    assert stats.waits == 0
+    assert stats.average_wait == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_priority_order() -> None:
+    """Waiting requests with a higher priority are sent first"""
+    limiter = ConcurrencyLimiter(1)
+    order: List[str] = []
+
+    first = asyncio.ensure_future(hold(limiter, 'first', order))
+    await asyncio.sleep(0)
+
+    waiting = []
+    for name, priority in [
+        ('low', 'low'),
+        ('normal', 'normal'),
+        ('high', 'high'),
+        ('high2', 'high'),
+    ]:
+        with query_priority(priority):  # type: ignore[arg-type]
+            waiting.append(asyncio.ensure_future(hold(limiter, name, order)))
+        await asyncio.sleep(0)
+
+    await asyncio.gather(first, *waiting)
+    assert order == ['first', 'high', 'high2', 'normal', 'low']
+
+    stats = limiter.stats()
+    assert stats.priorities['high'].requests == 2
+    assert stats.priorities['high'].waits == 2
+    assert stats.priorities['low'].max_wait > stats.priorities['high'].max_wait
+
+
+@pytest.mark.asyncio
+async def test_limiter_priority_limits() -> None:
+    """The number of requests in flight for a priority class can be capped"""
+    limiter = ConcurrencyLimiter(4, priority_limits={'low': 1})
+    peak = 0
+
+    async def low() -> None:
+        nonlocal peak
+        async with limiter.slot('low'):
+            peak = max(peak, limiter.stats().priorities['low'].in_flight)
+            await asyncio.sleep(0.01)
+
+    tasks = [asyncio.ensure_future(low()) for _ in range(5)]
+    await asyncio.sleep(0)
+
+    # requests with other priorities are not held up by the capped requests
+    order: List[str] = []
+    await asyncio.gather(*[hold(limiter, str(i), order, delay=0) for i in range(3)])
+    assert limiter.stats().priorities['low'].queued == 4
+
+    await asyncio.gather(*tasks)
+    assert peak == 1
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_priority_limits_without_limit() -> None:
+    """Priority classes can be capped without limiting every request"""
+    limiter = ConcurrencyLimiter(priority_limits={'low': 2})
+    await asyncio.gather(*[limiter.acquire('high') for _ in range(10)])
+    await limiter.acquire('low')
+    await limiter.acquire('low')
+
+    waiter = asyncio.ensure_future(limiter.acquire('low'))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    limiter.release('low')
+    await waiter
+    assert limiter.stats().priorities['low'].in_flight == 2
+
+
+def test_query_priority() -> None:
+    """The priority class is set within the block"""
+    assert get_query_priority() == 'normal'
+    with query_priority('low'):
+        assert get_query_priority() == 'low'
+        with query_priority('high'):
+            assert get_query_priority() == 'high'
+        assert get_query_priority() == 'low'
+    assert get_query_priority() == 'normal'
+
+    with pytest.raises(ValueError):
+        with query_priority('urgent'):  # type: ignore[arg-type]
+            pass
+
+
+@pytest.mark.parametrize(
+    'limit,timeout,priority_limits',
+    [
+        (0, None, None),
+        (-1, None, None),
+        (1, -1, None),
+        (1, None, {'low': 0}),
+        (1, None, {'urgent': 1}),
+    ],
+)
+def test_limiter_invalid_options(
+    limit: int,
+    timeout: float,
+    priority_limits: Dict[Priority, int],
+) -> None:
+    """Invalid limiter options raise an error"""
+    with pytest.raises(ValueError):
+        ConcurrencyLimiter(limit, timeout=timeout, priority_limits=priority_limits)
+
+
+@pytest.mark.asyncio
+async def test_client_max_concurrency() -> None:
+    """Queries made by the client are limited to the maximum concurrency"""
+    client = Client(max_concurrency=2)
+    await client.connect()
+
+    await asyncio.gather(*[client.post.count() for _ in range(10)])
+    stats = client.queue_stats()
+    assert stats.limit == 2
+    assert stats.requests == 10
+    assert stats.in_flight == 0
+    assert stats.max_queued > 0
+
+    await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_client_stream_nested_query() -> None:
+    """Queries can be made while consuming a stream without waiting behind the stream"""
+    client = Client(max_concurrency=1, max_queue_wait=5)
+    await client.connect()
+
+    await client.post.create({'title': 'Foo', 'published': False})
+    await client.post.create({'title': 'Bar', 'published': False})
+
+    titles = []
+    async for post in client.post.find_many_stream(order={'title': 'asc'}):
+        found = await client.post.find_unique(where={'id': post.id})
+        assert found is not None
+        titles.append(found.title)
+
+    assert titles == ['Bar', 'Foo']
+    assert client.queue_stats().in_flight == 0
+
+    await client.post.delete_many()
+    await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_client_query_priority() -> None:
+    """Queries made by the client are sent with the current priority class"""
+    client = Client(max_concurrency=2, priority_limits={'low': 1})
+    await client.connect()
+
+    with query_priority('low'):
+        await asyncio.gather(*[client.post.count() for _ in range(3)])
+
+    await client.post.count()
+
+    stats = client.queue_stats()
+    assert stats.priorities['low'].requests == 3
+    assert stats.priorities['low'].waits == 2
+    assert stats.priorities['normal'].requests == 1
+
+    await client.disconnect()
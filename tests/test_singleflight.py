@@ -0,0 +1,137 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+from prisma import Client
+from prisma._singleflight import SingleFlight
+
+
+class Sender:
+    def __init__(self, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> Dict[str, Any]:
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(self.delay)
+        return {'data': [call]}
+
+
+@pytest.mark.asyncio
+async def test_single_flight_deduplicates() -> None:
+    """Identical requests that are made while one is in flight share its result"""
+    flight = SingleFlight()
+    send = Sender()
+
+    results = await asyncio.gather(*[flight.execute('key', send) for _ in range(10)])
+    assert send.calls == 1
+    assert all(result == {'data': [1]} for result in results)
+
+    stats = flight.stats()
+    assert stats.requests == 10
+    assert stats.deduplicated == 9
+    assert stats.in_flight == 0
+
+    # requests made after the first request has finished are sent again
+    assert await flight.execute('key', send) == {'data': [2]}
+    assert send.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_different_keys() -> None:
+    """Requests with different keys are not deduplicated"""
+    flight = SingleFlight()
+    send = Sender()
+
+    await asyncio.gather(flight.execute('a', send), flight.execute('b', send))
+    assert send.calls == 2
+    assert flight.stats().deduplicated == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_copy() -> None:
+    """Callers that did not make the request are given a copy of the result"""
+    flight = SingleFlight(copy=lambda result: {'data': list(result['data'])})
+    results: List[Dict[str, Any]] = await asyncio.gather(
+        *[flight.execute('key', Sender()) for _ in range(3)]
+    )
+    results[0]['data'].append(0)
+    assert results[1] == {'data': [1]}
+    assert results[2] == {'data': [1]}
+    assert results[1]['data'] is not results[2]['data']
+
+
+@pytest.mark.asyncio
+async def test_single_flight_error() -> None:
+    """Errors are raised to every caller waiting for the request"""
+    flight = SingleFlight()
+    calls = 0
+
+    async def send() -> None:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError('Failed')
+
+    results = await asyncio.gather(
+        *[flight.execute('key', send) for _ in range(3)],
+        return_exceptions=True,
+    )
+    assert calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.stats().in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancelled() -> None:
+    """Cancelling the caller that made the request does not cancel it for other callers"""
+    flight = SingleFlight()
+    send = Sender()
+
+    first = asyncio.ensure_future(flight.execute('key', send))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(flight.execute('key', send))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    assert await second == {'data': [1]}
+    assert first.cancelled()
+    assert send.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_forget() -> None:
+    """Requests made after forget() are not deduplicated with requests already in flight"""
+    flight = SingleFlight()
+    send = Sender()
+
+    first = asyncio.ensure_future(flight.execute('key', send))
+    await asyncio.sleep(0)
+    flight.forget()
+
+    second = await flight.execute('key', send)
+    assert await first == {'data': [1]}
+    assert second == {'data': [2]}
+    assert flight.stats().deduplicated == 0
+
+
+@pytest.mark.asyncio
+async def test_client_deduplicate_queries() -> None:
+    """Identical queries made by the client at the same time are only sent once"""
+    client = Client(deduplicate_queries=True)
+    await client.connect()
+
+    user = await client.user.create({'name': 'Robert'})
+    users = await asyncio.gather(
+        *[client.user.find_unique(where={'id': user.id}) for _ in range(5)]
+    )
+    assert all(found == user for found in users)
+
+    stats = client.single_flight_stats()
+    assert stats is not None
+    assert stats.requests == 5
+    assert stats.deduplicated == 4
+
+    await client.user.delete(where={'id': user.id})
+    await client.disconnect()
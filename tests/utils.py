@@ -276,7 +276,7 @@ def assert_time_like_now(dt: datetime, threshold: int = 10) -> None:
 
 def assert_query_equals(query: Union[str, QueryBuilder], expected: str) -> None:
     if not isinstance(query, str):  # pragma: no branch
-        query = query.build_query()
+        query = query.build_query(pretty=True)
 
     # we have to dedent and remove leading and ending newlines
     # to support in-place query definitions